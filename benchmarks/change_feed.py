@@ -0,0 +1,79 @@
+"""Change feed vs. full reload: time and bytes for another session to converge.
+
+    python benchmarks/change_feed.py [--places 10000] [--changes 1 10 100]
+
+Session A makes ``changes`` edits through the app's own ``randomizer.db``
+functions (favorite toggles, one insert, one delete) against FakeSupabase.
+Session B then catches up either by applying the feed events
+(``apply_pending``) or by calling ``load_data()`` again as it did before.
+Bytes are the JSON size of the events vs. the full select body.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+
+from benchmarks.datasets import synthetic_places  # noqa: E402
+from benchmarks.fakes import install_fakes  # noqa: E402
+from randomizer import db, feed  # noqa: E402
+from randomizer.models import Place  # noqa: E402
+
+
+def make_changes(restaurants, n):
+    """Applies ``n`` writes to session A's list: favorite toggles, one insert and one delete."""
+    for i in range(n - 2):
+        db.toggle_favorite(restaurants, i)
+    new = Place(name="Bench Bistro", cuisine="French", price="$$", location="Loop",
+                address="1 W Madison St", type="restaurant")
+    restaurants.append(db.save_data([new]))
+    assert db.delete_restaurant(restaurants, len(restaurants) - 2)
+
+
+def bench(places, changes):
+    fake = install_fakes(synthetic_places(places))
+    feed.get_change_feed.clear()
+    change_feed = feed.get_change_feed()
+    session_b = db.load_data()
+    seen = change_feed.seq
+
+    session_a = db.load_data()
+    make_changes(session_a, changes)
+    events = change_feed.since(seen)
+    event_bytes = sum(len(json.dumps(row, default=str)) for _, _, row in events)
+
+    st.session_state.feed_seq = seen
+    start = time.perf_counter()
+    feed.apply_pending(session_b, db.load_data)
+    feed_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    reloaded = db.load_data()
+    reload_ms = (time.perf_counter() - start) * 1000
+
+    assert [(r.id, r.favorite) for r in session_b] == [(r.id, r.favorite) for r in reloaded]
+    return {
+        "events": len(events),
+        "feed_ms": round(feed_ms, 2),
+        "reload_ms": round(reload_ms, 2),
+        "feed_bytes": event_bytes,
+        "reload_bytes": len(fake.table("restaurants").payload()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=10000)
+    parser.add_argument("--changes", type=int, nargs="+", default=[3, 10, 100])
+    args = parser.parse_args()
+    results = {str(n): bench(args.places, n) for n in args.changes}
+    print(json.dumps({"places": args.places, "changes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Synthetic Chicago datasets in the Supabase ``restaurants`` row format."""
+import io
+import random
+from datetime import datetime, timedelta
+
+from randomizer.constants import BUCKET_NAME, CUISINES, NEIGHBORHOODS, PLACE_TYPES, PRICES
+
+SIZES = (1_000, 10_000, 100_000)
+
+STREETS = [
+    "N Clark St", "W Randolph St", "N Milwaukee Ave", "W Division St", "S Halsted St",
+    "N Broadway", "W Fulton Market", "S Wentworth Ave", "N Damen Ave", "W Armitage Ave",
+    "N Wells St", "W 18th St", "N Lincoln Ave", "W Chicago Ave", "S Michigan Ave",
+]
+NAME_WORDS = [
+    "Golden", "Little", "Blue", "Smoke", "Oak", "Lantern", "Harbor", "Maple", "Copper",
+    "Saint", "Velvet", "North", "Wild", "Royal", "Ember", "Dove", "Fig", "Salt",
+]
+NAME_SUFFIXES = [
+    "Kitchen", "Tavern", "Cantina", "Trattoria", "Bistro", "House", "Room", "Bar",
+    "Izakaya", "Grill", "Taqueria", "Lounge", "Social", "Table", "Cafe",
+]
+NOTE_PHRASES = [
+    "great patio", "get the mole", "ask for the off-menu tacos", "loud on weekends",
+    "best old fashioned in the city", "reservations needed on Fridays", "cash only",
+    "the short rib was incredible", "skip the dessert", "go for happy hour",
+    "dumplings were perfect", "bring a group and share plates", "service was slow",
+    "try the omakase", "natural wine list is great", "parking is rough",
+    "rooftop opens in May", "their negroni is worth it", "brunch line gets long",
+    "spicy but worth it", "good for a date night", "kid friendly", "tiny space so go early",
+]
+
+
+def _note(rng):
+    words = rng.sample(NOTE_PHRASES, rng.randint(1, 3))
+    return ". ".join(w.capitalize() for w in words) + "."
+
+
+def _reviews(rng):
+    # Mix the historical formats load_data normalizes: plain strings, {"comment": ...} dicts and blanks.
+    reviews = []
+    for _ in range(rng.choice((0, 0, 1, 1, 2, 3, 5))):
+        kind = rng.random()
+        if kind < 0.7:
+            reviews.append(_note(rng))
+        elif kind < 0.9:
+            reviews.append({"comment": "  " + _note(rng) + "  "})
+        else:
+            reviews.append(rng.choice(("", None, "   ")))
+    return reviews
+
+
+def synthetic_places(n, seed=0):
+    """Returns ``n`` restaurant rows spread over the app's neighborhood/cuisine lists."""
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    rows = []
+    for i in range(n):
+        name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_SUFFIXES)} {i}"
+        visited = rng.random() < 0.4
+        folder = name.replace(" ", "_")
+        mapped = rng.random() < 0.9
+        rows.append({
+            "id": i + 1,
+            "name": name,
+            "cuisine": rng.choice(CUISINES),
+            "price": rng.choice(PRICES),
+            "location": rng.choice(NEIGHBORHOODS),
+            "address": f"{rng.randint(1, 4999)} {rng.choice(STREETS)}, Chicago, IL",
+            "type": rng.choice(PLACE_TYPES),
+            "favorite": rng.random() < 0.2,
+            "visited": visited,
+            "visited_date": (start + timedelta(days=rng.randint(0, 700))).strftime("%B %d, %Y") if visited else None,
+            "reviews": _reviews(rng),
+            "images": [
+                f"https://storage.invalid/storage/v1/object/public/{BUCKET_NAME}/{folder}/{folder}_{k}_1700000000.jpg"
+                for k in range(rng.choice((0, 0, 1, 2, 3, 6)))
+            ],
+            "latitude": 41.88 + rng.uniform(-0.12, 0.12) if mapped else None,
+            "longitude": -87.65 + rng.uniform(-0.1, 0.1) if mapped else None,
+            "retired": rng.random() < 0.05,
+            "created_at": (start + timedelta(minutes=17 * i)).isoformat() + "+00:00",
+        })
+        # Older rows predate some columns; load_data fills them in.
+        if rng.random() < 0.1:
+            for key in ("favorite", "retired", "images", "latitude", "longitude"):
+                rows[-1].pop(key)
+    return rows
+
+
+def synthetic_photo(width=4032, height=3024, orientation=6, fmt="JPEG", seed=0):
+    """Returns an in-memory phone-sized photo (with an EXIF rotation) for upload benchmarks."""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    mode = "RGBA" if fmt == "PNG" else "RGB"
+    image = Image.new(mode, (width, height), tuple(rng.randrange(256) for _ in mode))
+    # A few blocks of noise-ish colour so the encoder has something to compress.
+    for _ in range(24):
+        x, y = rng.randrange(width), rng.randrange(height)
+        block = Image.new(mode, (width // 6, height // 6), tuple(rng.randrange(256) for _ in mode))
+        image.paste(block, (x, y))
+    buf = io.BytesIO()
+    if fmt == "JPEG":
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        image.save(buf, format=fmt, quality=92, exif=exif)
+    else:
+        image.save(buf, format=fmt)
+    buf.seek(0)
+    buf.name = f"photo_{seed}.{fmt.lower()}"
+    return buf
@@ -0,0 +1,252 @@
+"""In-process stand-ins for the Supabase client used by the benchmarks."""
+import copy
+import hashlib
+import http.client
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import urllib.response
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, table, op, payload=None):
+        self.table = table
+        self.op = op
+        self.payload = payload
+        self.filters = []
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def _matches(self, row):
+        return all(row.get(c) == v for c, v in self.filters)
+
+    def execute(self):
+        rows = self.table.rows
+        if self.op != "select":
+            self.table._payload = None
+        if self.op == "select":
+            if not self.filters:
+                # Decode a fresh copy like the real client does with the HTTP body.
+                return FakeResponse(json.loads(self.table.payload()))
+            return FakeResponse([copy.deepcopy(r) for r in rows if self._matches(r)])
+        if self.op == "insert":
+            row = dict(self.payload, id=next(self.table.ids))
+            row.setdefault("created_at", datetime.now().isoformat())
+            rows.append(row)
+            return FakeResponse([copy.deepcopy(row)])
+        if self.op == "update":
+            hit = [r for r in rows if self._matches(r)]
+            for r in hit:
+                r.update(self.payload)
+            return FakeResponse([copy.deepcopy(r) for r in hit])
+        if self.op == "delete":
+            hit = [r for r in rows if self._matches(r)]
+            self.table.rows = [r for r in rows if not self._matches(r)]
+            return FakeResponse(hit)
+        raise ValueError(self.op)
+
+
+class FakeTable:
+    def __init__(self, rows=()):
+        self.rows = [dict(r) for r in rows]
+        self.ids = itertools.count(max((r.get("id", 0) for r in self.rows), default=0) + 1)
+        self._payload = None
+
+    def payload(self):
+        """JSON body for a full select, re-serialized only when rows change."""
+        if self._payload is None:
+            self._payload = json.dumps(self.rows)
+        return self._payload
+
+    def select(self, columns="*"):
+        return FakeQuery(self, "select")
+
+    def insert(self, payload):
+        return FakeQuery(self, "insert", payload)
+
+    def update(self, payload):
+        return FakeQuery(self, "update", payload)
+
+    def delete(self):
+        return FakeQuery(self, "delete")
+
+
+class FakeBucket:
+    def __init__(self, name, files):
+        self.name = name
+        self.files = files
+
+    def upload(self, path, file, file_options=None):
+        self.files[path] = bytes(file)
+
+    def remove(self, paths):
+        for p in paths:
+            self.files.pop(p, None)
+
+    def get_public_url(self, path):
+        return f"https://storage.invalid/storage/v1/object/public/{self.name}/{path}"
+
+
+class FakeStorage:
+    def __init__(self):
+        self.files = {}
+
+    def from_(self, bucket):
+        return FakeBucket(bucket, self.files)
+
+
+class FakeSupabase:
+    """Just enough of ``supabase.Client`` for the calls the app makes."""
+
+    def __init__(self, rows=()):
+        self.tables = {"restaurants": FakeTable(rows)}
+        self.storage = FakeStorage()
+
+    def table(self, name):
+        return self.tables[name]
+
+
+
+class FakeLocation:
+    def __init__(self, latitude, longitude):
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+class FakeGeocoder:
+    """Deterministic ArcGIS stand-in: hashes the query to a point near the Loop."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def geocode(self, query):
+        self.calls += 1
+        h = zlib.crc32(query.encode())  # hash() is salted per process
+        return FakeLocation(41.88 + (h % 2000 - 1000) / 10000, -87.63 + (h // 2000 % 2000 - 1000) / 10000)
+
+
+class FakeStorageServer:
+    """Local HTTP stand-in for the public bucket, with ETag/If-None-Match and Range support.
+
+    ``latency`` seconds are slept per request to mimic the round trip to
+    Supabase; ``requests`` and ``bytes_sent`` count what the bucket served.
+    """
+
+    def __init__(self, objects=None, latency=0.0):
+        self.objects = dict(objects or {})
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_port}/{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(server.latency)
+                data = server.objects.get(self.path.lstrip("/"))
+                with server._lock:
+                    server.requests += 1
+                if data is None:
+                    self.send_error(404)
+                    return
+                etag = '"%s"' % hashlib.md5(data).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                status, body = 200, data
+                match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if match:
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else len(data) - 1
+                    status, body = 206, data[start:end + 1]
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{start + len(body) - 1}/{len(data)}")
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class FakeStorageHandler(urllib.request.BaseHandler):
+    """urllib handler answering FakeBucket public URLs from the fake's files, without a network."""
+
+    handler_order = 100  # ahead of the real HTTPSHandler
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def https_open(self, req):
+        path = urllib.parse.urlparse(req.full_url).path.split("/object/public/", 1)[-1]
+        data = self.storage.files.get(path.split("/", 1)[-1])
+        if data is None:
+            raise urllib.error.HTTPError(req.full_url, 404, "Not Found", http.client.HTTPMessage(), None)
+        headers = http.client.HTTPMessage()
+        headers["ETag"] = '"%s"' % hashlib.md5(data).hexdigest()
+        if req.get_header("If-none-match") == headers["ETag"]:
+            raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", headers, None)
+        return urllib.response.addinfourl(io.BytesIO(data), headers, req.full_url, 200)
+
+
+def install_fakes(rows=(), geocoder=None):
+    """Points the data layer at a FakeSupabase (and optional FakeGeocoder) and returns the client.
+
+    The notes index and photo cache are redirected to temp paths so runs
+    never touch data/ or static/, and photo fetches are answered from the
+    fake bucket.
+    """
+    from randomizer import db, geo, images, photo_cache, search
+
+    search.INDEX_PATH = os.path.join(tempfile.gettempdir(), "randomizer-bench-notes_index.bin")
+    fake = FakeSupabase(rows)
+    photos = photo_cache.PhotoCache(
+        os.path.join(tempfile.gettempdir(), "randomizer-bench-photos"),
+        os.path.join(tempfile.gettempdir(), "randomizer-bench-photo_cache.json"),
+        opener=urllib.request.build_opener(FakeStorageHandler(fake.storage)),
+    )
+    photo_cache.get_photo_cache = images.get_photo_cache = lambda: photos
+    db.get_supabase = lambda url, key: fake
+    db.get_client = images.get_client = lambda: fake
+    if geocoder is not None:
+        geo.get_geolocator = lambda: geocoder
+    return fake
@@ -0,0 +1,139 @@
+"""Photo cache: bucket traffic and serve time with and without the local cache.
+
+    python benchmarks/photo_cache.py [--photos 200] [--views 1000] [--latency 0.02] [--cache-mb 40]
+
+Photos live on a local FakeStorageServer that sleeps ``--latency`` per
+request. ``views`` photo views are drawn with a skewed (Zipf-like)
+popularity, as a few favourites get opened far more than the rest:
+
+* ``direct`` - every view downloads the bucket URL, as before the cache
+* ``cached`` - every view goes through ``PhotoCache.src``; misses are
+  fetched in the background, so views in the meantime still hit the bucket
+* ``revalidate`` - every cached photo is revalidated once (304s, no body)
+
+Run with a ``--cache-mb`` below the total photo size to exercise eviction.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fakes import FakeStorageServer  # noqa: E402
+from randomizer.photo_cache import PhotoCache  # noqa: E402
+
+
+def p95(samples):
+    samples = sorted(samples)
+    return round(samples[int(0.95 * (len(samples) - 1))], 3)
+
+
+def make_photos(n, seed=0):
+    """Incompressible stand-ins sized like process_image output (150-450KB JPEGs)."""
+    rng = random.Random(seed)
+    return {f"restaurant-images/Place_{i}/Place_{i}_0_1700000000.jpg": rng.randbytes(rng.randint(150_000, 450_000))
+            for i in range(n)}
+
+
+def view_sequence(urls, views, seed=0):
+    weights = [1 / (rank + 1) for rank in range(len(urls))]
+    return random.Random(seed).choices(urls, weights=weights, k=views)
+
+
+def download(url):
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+
+def bench_direct(server, sequence):
+    start_bytes = server.bytes_sent
+    samples = []
+    for url in sequence:
+        start = time.perf_counter()
+        download(url)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "bucket_requests": len(sequence),
+        "bucket_bytes": server.bytes_sent - start_bytes,
+        "p95_view_ms": p95(samples),
+        "median_view_ms": round(statistics.median(samples), 3),
+    }
+
+
+def bench_cached(server, sequence, cache):
+    start_requests, start_bytes = server.requests, server.bytes_sent
+    samples = []
+    for url in sequence:
+        start = time.perf_counter()
+        src = cache.src(url)
+        if src == url:
+            download(url)  # miss: the browser still gets the bucket URL this time
+        samples.append((time.perf_counter() - start) * 1000)
+    cache.wait()
+    stats = cache.stats()
+    return {
+        "bucket_requests": server.requests - start_requests,
+        "bucket_bytes": server.bytes_sent - start_bytes,
+        "p95_view_ms": p95(samples),
+        "median_view_ms": round(statistics.median(samples), 3),
+        "cache": stats,
+    }
+
+
+def bench_revalidate(server, cache):
+    start_requests, start_bytes = server.requests, server.bytes_sent
+    start = time.perf_counter()
+    for url in list(cache.entries):
+        cache.fetch(url)
+    return {
+        "photos": len(cache.entries),
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "bucket_requests": server.requests - start_requests,
+        "bucket_bytes": server.bytes_sent - start_bytes,
+        "not_modified": cache.revalidated,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=200)
+    parser.add_argument("--views", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--cache-mb", type=int, default=40)
+    args = parser.parse_args()
+
+    photos = make_photos(args.photos)
+    server = FakeStorageServer(photos, latency=args.latency)
+    urls = [server.url(path) for path in photos]
+    sequence = view_sequence(urls, args.views)
+    workdir = tempfile.mkdtemp(prefix="randomizer-bench-photos-")
+    try:
+        cache = PhotoCache(os.path.join(workdir, "photos"), os.path.join(workdir, "index.json"),
+                           max_bytes=args.cache_mb * 1024 * 1024)
+        results = {
+            "photos": args.photos,
+            "photo_bytes": sum(len(b) for b in photos.values()),
+            "views": args.views,
+            "latency_s": args.latency,
+            "cache_mb": args.cache_mb,
+            "direct": bench_direct(server, sequence),
+            "cached": bench_cached(server, sequence, cache),
+        }
+        results["revalidate"] = bench_revalidate(server, cache)
+        results["restart_entries"] = len(PhotoCache(cache.directory, cache.index_path))
+    finally:
+        server.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
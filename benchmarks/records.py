@@ -0,0 +1,108 @@
+"""Memory per record and load time: legacy dict rows vs ``randomizer.models.Place``.
+
+    python benchmarks/records.py [--places 100000] [--repeat 5]
+
+Rows are decoded from a JSON body each run (as the Supabase client does),
+so repeated category strings start out as separate objects. Retained bytes
+include the decoded row data the records keep alive. The dict path
+reproduces the ``setdefault`` normalization load_data used before Place;
+the place path is ``Place.from_rows`` as load_data calls it. Load time is
+the best of ``--repeat`` runs.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.datasets import synthetic_places  # noqa: E402
+from randomizer.models import Place  # noqa: E402
+
+
+def legacy_normalize(data):
+    for place in data:
+        place.setdefault("favorite", False)
+        place.setdefault("visited", False)
+        place.setdefault("visited_date", None)
+        place.setdefault("reviews", [])
+        place.setdefault("images", [])
+        place.setdefault("latitude", None)
+        place.setdefault("longitude", None)
+        place.setdefault("retired", False)
+        place.setdefault("created_at", None)
+
+        normalized = []
+        for rev in place.get("reviews", []):
+            if rev:
+                if isinstance(rev, dict) and "comment" in rev:
+                    cleaned = str(rev["comment"]).strip()
+                elif isinstance(rev, str):
+                    cleaned = str(rev).strip()
+                else:
+                    cleaned = ""
+                if cleaned:
+                    normalized.append(cleaned)
+        place["reviews"] = normalized
+    return data
+
+
+def place_normalize(data):
+    return Place.from_rows(data)
+
+
+def run(body, normalize, n, repeat):
+    # Timed without tracemalloc (it slows allocation), then measured with it.
+    elapsed = float("inf")
+    for _ in range(repeat):
+        rows = json.loads(body)
+        start = time.perf_counter()
+        normalize(rows)
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del rows
+
+    gc.collect()
+    tracemalloc.start()
+    records = normalize(json.loads(body))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Sorting by created date exercises the lazy parse on Place.
+    sort_start = time.perf_counter()
+    if isinstance(records[0], Place):
+        sorted(records, key=lambda p: p.created)
+    else:
+        from datetime import datetime
+        sorted(records, key=lambda x: datetime.fromisoformat(x["created_at"]).replace(tzinfo=None)
+               if x.get("created_at") else datetime.min)
+    sort_ms = (time.perf_counter() - sort_start) * 1000
+    del records
+    return {
+        "normalize_ms": round(elapsed * 1000, 1),
+        "retained_bytes_per_record": round(current / n, 1),
+        "peak_mb": round(peak / 2**20, 1),
+        "sort_by_created_ms": round(sort_ms, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.dumps(synthetic_places(args.places))
+    results = {
+        "places": args.places,
+        "dict": run(body, legacy_normalize, args.places, args.repeat),
+        "place": run(body, place_normalize, args.places, args.repeat),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
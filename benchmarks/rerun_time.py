@@ -0,0 +1,59 @@
+"""Rerun wall time per view, driven headlessly through Streamlit's AppTest.
+
+    python benchmarks/rerun_time.py [--places 200] [--reruns 5]
+
+The Supabase client is replaced by ``benchmarks.fakes.FakeSupabase`` so no
+network is touched. Each view is selected once (first render, cold caches)
+and then rerun ``--reruns`` times to time what a widget click costs.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from benchmarks.datasets import synthetic_places  # noqa: E402
+from benchmarks.fakes import install_fakes  # noqa: E402
+from randomizer.views import VIEWS  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=200)
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    install_fakes(synthetic_places(args.places))
+
+    at = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=120)
+    at.run()
+
+    results = {"places": args.places, "views": {}}
+    for action in VIEWS:
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value(action).run()
+        first_ms = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise RuntimeError(f"{action}: {at.exception[0].message}")
+
+        samples = []
+        for _ in range(args.reruns):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1000)
+        results["views"][action] = {
+            "first_ms": round(first_ms, 1),
+            "rerun_median_ms": round(statistics.median(samples), 1),
+            "rerun_max_ms": round(max(samples), 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Similarity index ("places like this"): build, incremental maintenance and top-k latency.
+
+    python benchmarks/similar.py [--places 100000] [--queries 500] [--limit 5]
+
+Times the batch build load_data does, a re-sync with nothing changed (a
+new session), single-place edit/insert/delete as the change feed applies
+them, and top-k queries for random picks. The target is a p95 query under
+``TARGET_MS``.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.datasets import synthetic_places  # noqa: E402
+from randomizer.models import Place  # noqa: E402
+from randomizer.similar import DIM, SimilarityIndex  # noqa: E402
+
+TARGET_MS = 10.0
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return round(samples[int(q * (len(samples) - 1))], 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    places = Place.from_rows(synthetic_places(args.places))
+    index = SimilarityIndex()
+    build_ms = timed_ms(lambda: index.sync(places))
+    resync_ms = timed_ms(lambda: index.sync(places))
+
+    rng = random.Random(0)
+    picks = [rng.choice(places).id for _ in range(args.queries)]
+    index.similar(picks[0], args.limit)  # warm up
+    samples = [timed_ms(lambda: index.similar(pid, args.limit)) for pid in picks]
+
+    edited = places[1]
+    edited.update(cuisine=places[2].cuisine, reviews=edited.reviews + ("Great patio, get the mole",))
+    new = Place(name="Bench Bistro", cuisine="French", price="$$", location="Loop", address="1 W Madison St",
+                type="restaurant", latitude=41.882, longitude=-87.628, id=args.places + 1)
+
+    results = {
+        "places": args.places,
+        "dim": DIM,
+        "matrix_bytes": index.matrix[:index.size].nbytes,
+        "build_ms": round(build_ms, 1),
+        "resync_unchanged_ms": round(resync_ms, 1),
+        "update_ms": round(timed_ms(lambda: index.update_place(edited)), 3),
+        "insert_ms": round(timed_ms(lambda: index.update_place(new)), 3),
+        "delete_ms": round(timed_ms(lambda: index.remove_place(places[3].id)), 3),
+        "query": {
+            "limit": args.limit,
+            "queries": args.queries,
+            "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": percentile(samples, 0.95),
+            "max_ms": round(max(samples), 3),
+        },
+        "target_p95_ms": TARGET_MS,
+    }
+    results["meets_target"] = results["query"]["p95_ms"] < TARGET_MS
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
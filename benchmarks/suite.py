@@ -0,0 +1,201 @@
+"""Benchmark suite over synthetic Chicago datasets.
+
+    python benchmarks/suite.py [--sizes 1000 10000 100000] [--repeat 5] [--output results.json]
+
+Drives the app's own code paths against in-process fakes (FakeSupabase,
+FakeGeocoder) and prints one JSON document, so runs can be diffed or
+appended to a history file to track regressions:
+
+* ``load_data`` - fetch + row normalization
+* ``search`` / ``sort`` - View All search terms and every sort option
+* ``note_index`` / ``note_search`` - notes index rebuild vs. restart from
+  disk, and BM25 queries against the index load_data built
+* ``filter`` - Random Pick filter combinations
+* ``similar`` - top-5 "places like this" for a Random Pick result
+* ``map_markers`` / ``map_build`` - Map View marker rows and the folium
+  build (the build is capped at ``--map-limit`` markers, folium is slow)
+* ``process_image`` / ``upload`` - photo resize/re-encode and the upload path
+* ``geocode`` - get_lat_lon with the 1s throttle sleep skipped
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.datasets import SIZES, synthetic_photo, synthetic_places  # noqa: E402
+from benchmarks.fakes import FakeGeocoder, install_fakes  # noqa: E402
+from randomizer import db, geo, images  # noqa: E402
+from randomizer.constants import VISITED_OPTIONS  # noqa: E402
+from randomizer.search import NoteIndex, get_note_index  # noqa: E402
+from randomizer.similar import get_similarity_index  # noqa: E402
+from randomizer.views.map_view import build_map, marker_rows  # noqa: E402
+from randomizer.views.random_pick import filter_places  # noqa: E402
+from randomizer.views.view_all import SORT_OPTIONS, search_places, sort_places  # noqa: E402
+
+SEARCH_TERMS = ["", "taco", "west loop", "italian", "n clark", "zzz-no-match"]
+NOTE_TERMS = ["patio", "get the mole", "old fashioned negroni", "zzz-no-match"]
+FILTERS = [
+    {"name": "none", "args": ([], [], [], "all", "All", True, False)},
+    {"name": "default", "args": ([], [], [], "all", "All", False, False)},
+    {"name": "cuisine+hood", "args": (["Mexican", "Thai"], ["Pilsen", "West Loop"], [], "all", "All", False, False)},
+    {"name": "bars_not_visited_favs", "args": ([], [], ["$$", "$$$"], "cocktail_bar", VISITED_OPTIONS[2], False, True)},
+]
+
+
+def measure(fn, repeat):
+    """Runs ``fn`` ``repeat`` times and returns timing stats in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "repeat": repeat,
+    }
+
+
+def bench_dataset(n, repeat, map_limit):
+    rows = synthetic_places(n)
+    install_fakes(rows)
+    results = {"load_data": measure(db.load_data, repeat)}
+    restaurants = db.load_data()
+
+    results["search"] = {
+        term or "<empty>": measure(lambda: search_places(restaurants, term), repeat)
+        for term in SEARCH_TERMS
+    }
+    results["note_index"] = bench_note_index(restaurants)
+    results["note_search"] = {
+        term or "<empty>": measure(lambda: get_note_index().search(term), repeat)
+        for term in NOTE_TERMS
+    }
+    results["sort"] = {
+        option: measure(lambda: sort_places(restaurants, option), repeat)
+        for option in SORT_OPTIONS
+    }
+    results["filter"] = {
+        f["name"]: measure(lambda: filter_places(restaurants, *f["args"]), repeat)
+        for f in FILTERS
+    }
+    pick = restaurants[len(restaurants) // 2].id
+    results["similar"] = measure(lambda: get_similarity_index().similar(pick), repeat)
+    results["map_markers"] = measure(lambda: marker_rows(restaurants), repeat)
+    markers, _ = marker_rows(restaurants)
+    markers = markers[:map_limit]
+    build_map.__wrapped__(markers[:1])  # warm up the folium import
+    # Bypass the st.cache_resource layer so every run really builds the map.
+    results["map_build"] = dict(measure(lambda: build_map.__wrapped__(markers), max(1, repeat // 2)),
+                                markers=len(markers))
+    return results
+
+
+def bench_note_index(restaurants):
+    """Full rebuild vs. restart from the saved file (load + incremental sync)."""
+    index = NoteIndex()
+    start = time.perf_counter()
+    index.sync(restaurants)
+    build_ms = (time.perf_counter() - start) * 1000
+    path = os.path.join(tempfile.gettempdir(), "randomizer-bench-notes_index-copy.bin")
+    start = time.perf_counter()
+    index.save(path)
+    save_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    restored = NoteIndex.load(path)
+    restored.sync(restaurants)
+    restart_ms = (time.perf_counter() - start) * 1000
+    return {
+        "notes": len(index),
+        "terms": len(index.postings),
+        "build_ms": round(build_ms, 1),
+        "save_ms": round(save_ms, 1),
+        "restart_ms": round(restart_ms, 1),
+        "file_bytes": os.path.getsize(path),
+    }
+
+
+def bench_images(repeat):
+    photos = {
+        "jpeg_4032x3024_rotated": lambda: synthetic_photo(),
+        "png_rgba_2000x1500": lambda: synthetic_photo(2000, 1500, fmt="PNG", seed=1),
+    }
+    results = {}
+    for label, make in photos.items():
+        inputs = [make() for _ in range(repeat)]
+        it = iter(inputs)
+        results[label] = measure(lambda: images.process_image(next(it)), repeat)
+
+    fake = install_fakes()
+    batch = [synthetic_photo(seed=i) for i in range(3)]
+
+    def upload():
+        for f in batch:
+            f.seek(0)
+        images.upload_images_to_supabase(batch, "Bench Place")
+
+    results["upload_3_photos"] = dict(measure(upload, repeat),
+                                      stored_bytes=sum(len(b) for b in fake.storage.files.values()))
+    return results
+
+
+def bench_geocode(repeat):
+    geocoder = FakeGeocoder()
+    install_fakes(geocoder=geocoder)
+    real_sleep = geo.time.sleep
+    geo.time.sleep = lambda seconds: None
+    try:
+        return measure(lambda: geo.get_lat_lon("1600 W Fulton Market"), repeat)
+    finally:
+        geo.time.sleep = real_sleep
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--map-limit", type=int, default=1000)
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "datasets": {},
+    }
+    for n in args.sizes:
+        results["datasets"][str(n)] = bench_dataset(n, args.repeat, args.map_limit)
+    results["images"] = bench_images(args.repeat)
+    results["geocode"] = bench_geocode(args.repeat)
+
+    doc = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(doc)
+    print(doc)
+
+
+if __name__ == "__main__":
+    main()
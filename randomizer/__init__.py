@@ -0,0 +1 @@
+"""Data layer and views for the Chicago Restaurant/Bar Randomizer."""
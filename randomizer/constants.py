@@ -0,0 +1,39 @@
+BUCKET_NAME = "restaurant-images"
+
+NEIGHBORHOODS = [
+    "Berwyn",
+    "Chinatown",
+    "Fulton Market",
+    "Gold Coast",
+    "Lincoln Park",
+    "Logan Square",
+    "Near North Side",
+    "Oakbrook",
+    "Oak Lawn",
+    "Pilsen",
+    "River North",
+    "South Loop",
+    "West Loop",
+    "West Town",
+    "Wicker Park"
+]
+CUISINES = [
+    "American", 
+    "Asian", 
+    "Chinese", 
+    "Cocktails", 
+    "French", 
+    "Indian", 
+    "Italian", 
+    "Japanese", 
+    "Mediterranean", 
+    "Mexican", 
+    "Other", 
+    "Seafood", 
+    "Spanish", 
+    "Steakhouse", 
+    "Thai"
+]
+PRICES = ["$", "$$", "$$$", "$$$$"]
+PLACE_TYPES = ["restaurant", "cocktail_bar"]
+VISITED_OPTIONS = ["All", "Visited Only", "Not Visited Yet"]
@@ -0,0 +1,127 @@
+import streamlit as st
+
+from randomizer import feed, perf, photo_cache, search, similar
+from randomizer.constants import BUCKET_NAME
+from randomizer.models import Place
+
+
+@st.cache_resource(show_spinner=False)
+def get_supabase(url, key):
+    """Creates the Supabase client once per process."""
+    from supabase import create_client
+    return create_client(url, key)
+
+
+def get_client():
+    """Returns the shared Supabase client built from the app secrets."""
+    try:
+        supabase_url = st.secrets["SUPABASE_URL"]
+        supabase_key = st.secrets["SUPABASE_ANON_KEY"]
+    except FileNotFoundError:
+        st.error("Secrets not found. Please set up your .streamlit/secrets.toml file.")
+        st.stop()
+    return get_supabase(supabase_url, supabase_key)
+
+
+@perf.timed("db.load_data")
+def load_data():
+    try:
+        response = get_client().table("restaurants").select("*").execute()
+        data = response.data
+        perf.count("db.remote_calls")
+        perf.count("db.rows_loaded", len(data))
+        places = Place.from_rows(data)
+        index = search.get_note_index()
+        index.sync(places)
+        index.save_async()
+        similar.get_similarity_index().sync(places)
+        return places
+    except Exception as e:
+        st.error(f"Error loading data: {str(e)}")
+        return []
+
+
+@perf.timed("db.save_data")
+def save_data(data):
+    try:
+        supabase = get_client()
+        for place in data:
+            update_data = place.to_row()
+            if place.id:
+                supabase.table("restaurants").update(update_data).eq("id", place.id).execute()
+                perf.count("db.remote_calls")
+                feed.get_change_feed().publish(feed.UPDATE, feed.place_row(place))
+            else:
+                response = supabase.table("restaurants").insert(update_data).execute()
+                perf.count("db.remote_calls")
+                if response.data:
+                    inserted = Place.from_row(response.data[0])
+                    feed.get_change_feed().publish(feed.INSERT, response.data[0])
+                    return inserted
+        return None
+    except Exception as e:
+        st.error(f"Error saving data: {str(e)}")
+        return None
+
+
+@perf.timed("db.delete_restaurant")
+def delete_restaurant(restaurants, index):
+    """Deletes a place's photos and row and drops it from ``restaurants``; False if the row delete failed."""
+    r = restaurants[index]
+    supabase = get_client()
+    
+    # 1. DELETE THE ACTUAL FILES FROM STORAGE BUCKET
+    if r.images:
+        paths_to_delete = []
+        for url in r.images:
+            try:
+                # We need to turn the full URL into just the 'folder/file.jpg' path
+                # Example URL: https://xyz.supabase.co/storage/v1/object/public/restaurant-images/Tacos/pic.jpg
+                # We need: Tacos/pic.jpg
+                if BUCKET_NAME in url:
+                    # Split the URL by the bucket name and take everything after it
+                    file_path = url.split(f"{BUCKET_NAME}/")[-1]
+                    paths_to_delete.append(file_path)
+            except Exception as e:
+                st.warning(f"Could not figure out storage path for: {url}")
+
+        if paths_to_delete:
+            try:
+                # 1. Try deleting the calculated paths
+                supabase.storage.from_(BUCKET_NAME).remove(paths_to_delete)
+                perf.count("storage.remote_calls")
+            except Exception as e:
+                # 2. If that fails, try a 'lazy' search for the filename 
+                # (This helps fix old entries with broken paths)
+                for path in paths_to_delete:
+                    try:
+                        filename = path.split('/')[-1]
+                        # Look for the file in the root if it's not in the folder
+                        supabase.storage.from_(BUCKET_NAME).remove([filename])
+                    except:
+                        pass
+        for url in r.images:
+            photo_cache.get_photo_cache().discard(url)
+    # 2. DELETE THE ROW FROM THE DATABASE TABLE
+    # This is what makes it disappear from your app (and stay gone after reboot)
+    if r.id is not None:
+        try:
+            supabase.table("restaurants").delete().eq("id", r.id).execute()
+            perf.count("db.remote_calls")
+        except Exception as e:
+            st.error(f"Database delete failed: {e}")
+            return False
+        feed.get_change_feed().publish(feed.DELETE, {"id": r.id})
+
+    del restaurants[index]
+    return True
+
+
+def toggle_favorite(restaurants, idx):
+    restaurants[idx].favorite = not restaurants[idx].favorite
+    save_data([restaurants[idx]])
+
+
+def toggle_visited(restaurants, idx):
+    restaurants[idx].visited = not restaurants[idx].visited
+    save_data([restaurants[idx]])
@@ -0,0 +1,177 @@
+"""Row-level change feed shared by every session in the process.
+
+Writes made through ``randomizer.db`` publish INSERT/UPDATE/DELETE events
+here, and so does the optional Supabase realtime subscriber for writes made
+by other processes. Each session remembers the last sequence number it
+applied and patches its own ``restaurants`` list from the events after it,
+instead of reloading the whole table. A small fragment polls the sequence
+number and only reruns the app when something actually changed.
+"""
+import asyncio
+import json
+import threading
+from collections import deque
+
+import streamlit as st
+
+from randomizer import perf, search, similar
+from randomizer.models import Place
+
+MAX_EVENTS = 1000
+POLL_SECONDS = 2
+
+INSERT = "INSERT"
+UPDATE = "UPDATE"
+DELETE = "DELETE"
+
+
+class ChangeFeed:
+    """Bounded, sequenced log of row events; sessions that fall behind it reload instead."""
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.seq = 0
+        self._events = deque(maxlen=max_events)
+        self._latest = {}  # place id -> normalized row (None once deleted), to drop echoes
+        self._lock = threading.Lock()
+
+    def publish(self, kind, row):
+        """Records one change and updates the process-wide search indexes. Returns its sequence number."""
+        place_id = row.get("id")
+        if place_id is None:
+            return self.seq
+        place = None if kind == DELETE else Place.from_row(row)
+        normalized = None if place is None else place.to_row()
+        with self._lock:
+            # Realtime echoes our own writes back; skip events that change nothing.
+            if place_id in self._latest and self._latest[place_id] == normalized:
+                return self.seq
+            self._latest[place_id] = normalized
+            self.seq += 1
+            self._events.append((self.seq, kind, dict(row)))
+            seq = self.seq
+        perf.count("feed.events")
+        perf.count("feed.bytes", len(json.dumps(row, default=str)))
+
+        index = search.get_note_index()
+        neighbours = similar.get_similarity_index()
+        if place is None:
+            index.remove_place(place_id)
+            neighbours.remove_place(place_id)
+        else:
+            index.update_place(place_id, place.reviews)
+            neighbours.update_place(place)
+        index.save_async()
+        return seq
+
+    def since(self, seq):
+        """Events after ``seq``, or None if the log no longer reaches back that far."""
+        with self._lock:
+            if seq >= self.seq:
+                return []
+            if not self._events or self._events[0][0] > seq + 1:
+                return None
+            return [e for e in self._events if e[0] > seq]
+
+
+@st.cache_resource(show_spinner=False)
+def get_change_feed():
+    return ChangeFeed()
+
+
+def place_row(place):
+    """The full row (with id and created_at) a local write publishes."""
+    return dict(place.to_row(), id=place.id, created_at=place.created_at)
+
+
+@perf.timed("feed.apply")
+def apply_events(restaurants, events):
+    """Patches ``restaurants`` in place from feed events; idempotent. Returns the kinds applied."""
+    by_id = {r.id: i for i, r in enumerate(restaurants)}
+    kinds = set()
+    deleted = set()
+    for _, kind, row in events:
+        place_id = row.get("id")
+        i = by_id.get(place_id)
+        if kind == DELETE:
+            if i is not None and place_id not in deleted:
+                deleted.add(place_id)
+                kinds.add(kind)
+            continue
+        deleted.discard(place_id)
+        incoming = Place.from_row(row)
+        if i is None:
+            by_id[place_id] = len(restaurants)
+            restaurants.append(incoming)
+            kinds.add(INSERT)
+        else:
+            # Keep the existing object so last_pick and list.index() still find it.
+            restaurants[i].refresh(incoming)
+            kinds.add(UPDATE)
+    if deleted:
+        restaurants[:] = [r for r in restaurants if r.id not in deleted]
+    return kinds
+
+
+def apply_pending(restaurants, reload):
+    """Brings this session's list up to date with the feed.
+
+    Returns the set of event kinds applied; ``reload()`` is used to refetch
+    everything when the session fell further behind than the log keeps.
+    """
+    feed = get_change_feed()
+    seen = st.session_state.get("feed_seq", feed.seq)
+    latest = feed.seq
+    events = feed.since(seen)
+    if events is None:
+        restaurants[:] = reload()
+        kinds = {INSERT, UPDATE, DELETE}
+    else:
+        kinds = apply_events(restaurants, events) if events else set()
+    st.session_state.feed_seq = latest
+    return kinds
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def watch_feed():
+    """Reruns the whole app only when another session or process changed a row."""
+    if get_change_feed().seq != st.session_state.get("feed_seq"):
+        st.rerun(scope="app")
+
+
+def connect_realtime():
+    """Starts the realtime subscriber when ``SUPABASE_REALTIME = true`` is in the secrets.
+
+    Realtime must also be enabled for the ``restaurants`` table in Supabase.
+    Without it, changes made in this process still reach every session.
+    """
+    try:
+        if not st.secrets.get("SUPABASE_REALTIME", False):
+            return None
+        return start_realtime(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_ANON_KEY"])
+    except (FileNotFoundError, KeyError):
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def start_realtime(url, key):
+    """Subscribes to Supabase realtime row changes on a background thread, once per process."""
+    feed = get_change_feed()
+
+    def on_change(payload):
+        data = payload.get("data", payload)
+        kind = str(data.get("type", "")).upper().rsplit(".", 1)[-1]
+        row = data.get("record") or data.get("old_record") or {}
+        if kind in (INSERT, UPDATE, DELETE):
+            feed.publish(kind, row)
+
+    async def listen():
+        from supabase import acreate_client
+
+        client = await acreate_client(url, key)
+        channel = client.channel("restaurants-changes")
+        await channel.on_postgres_changes("*", schema="public", table="restaurants", callback=on_change).subscribe()
+        await asyncio.Event().wait()
+
+    thread = threading.Thread(target=asyncio.run, args=(listen(),), name="supabase-realtime", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,51 @@
+import time
+import urllib.parse
+
+import streamlit as st
+
+from randomizer import perf
+
+
+@st.cache_resource(show_spinner=False)
+def get_geolocator():
+    """Creates the ArcGIS geocoder once per process."""
+    from geopy.geocoders import ArcGIS
+    return ArcGIS(timeout=10)
+
+
+@perf.timed("geo.get_lat_lon")
+def get_lat_lon(address):
+    """Converts an address string to latitude and longitude using ArcGIS."""
+    try:
+        time.sleep(1)  # 1-second delay to avoid throttling
+        clean_addr = address.strip()
+        if not clean_addr:
+            return None, None
+
+        if "chicago" not in clean_addr.lower() and "il" not in clean_addr.lower():
+            search_query = f"{clean_addr}, Chicago, IL"
+        else:
+            search_query = clean_addr
+
+        for attempt in range(3):
+            try:
+                perf.count("geo.remote_calls")
+                location = get_geolocator().geocode(search_query)
+                if location:
+                    return location.latitude, location.longitude
+                return None, None
+            except Exception as e:
+                if "timeout" in str(e).lower() or "rate" in str(e).lower():
+                    time.sleep(2 ** attempt)
+                else:
+                    raise e
+        st.warning("Geocoding failed after retries.")
+        return None, None
+    except Exception as e:
+        st.error(f"Geocoding error: {e}")
+        return None, None
+
+
+def google_maps_link(address, name=""):
+    query = f"{name}, {address}" if name else address
+    return f"https://www.google.com/maps/search/?api=1&query={urllib.parse.quote(query)}"
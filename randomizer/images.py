@@ -0,0 +1,96 @@
+import io
+import time
+import urllib.parse
+
+import streamlit as st
+
+from randomizer import perf
+from randomizer.constants import BUCKET_NAME
+from randomizer.db import get_client
+from randomizer.photo_cache import get_photo_cache
+
+
+@perf.timed("images.process_image")
+def process_image(file):
+    """Fixes orientation, downsizes to 1200px and re-encodes as an optimized JPEG."""
+    from PIL import Image, ImageOps  # Only needed when photos are uploaded
+
+    image = Image.open(file)
+    
+    # Fix orientation (handle EXIF rotation common in phone photos)
+    image = ImageOps.exif_transpose(image)
+    
+    # Convert to RGB (in case of PNG/RGBA) to allow JPEG saving
+    if image.mode in ("RGBA", "P"):
+        image = image.convert("RGB")
+
+    # Resize if too large (max width/height 1200px)
+    max_size = (1200, 1200)
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    # Save to a byte buffer as optimized JPEG
+    output_buffer = io.BytesIO()
+    image.save(output_buffer, format="JPEG", quality=80, optimize=True)
+    return output_buffer.getvalue()
+
+
+# REPLACED FUNCTION: Now handles resizing and compression
+@perf.timed("images.upload_images_to_supabase")
+def upload_images_to_supabase(uploaded_files, restaurant_name):
+    supabase = get_client()
+    urls = []
+    # Sanitize name for the file path
+    sanitized_name = "".join(c for c in restaurant_name if c.isalnum() or c in " -_").rstrip()
+
+    for i, file in enumerate(uploaded_files):
+        # 1. PROCESS THE IMAGE (Resize & Compress)
+        try:
+            file_data = process_image(file)
+            
+            # Force extension to .jpg since we converted it
+            filename = f"{sanitized_name}_{i}_{int(time.time())}.jpg"
+            mime_type = "image/jpeg"
+
+        except Exception as e:
+            st.error(f"Error processing image {file.name}: {e}")
+            continue
+
+        file_path = f"{sanitized_name}/{filename}"
+
+        # 2. UPLOAD TO SUPABASE
+        for attempt in range(3):
+            try:
+                supabase.storage.from_(BUCKET_NAME).upload(
+                    path=file_path,
+                    file=file_data,  # Use our compressed data, not the original file
+                    file_options={"content-type": mime_type, "upsert": "true"}
+                )
+                perf.count("storage.remote_calls")
+                perf.count("storage.upload_bytes", len(file_data))
+                public_url = supabase.storage.from_(BUCKET_NAME).get_public_url(file_path)
+                urls.append(public_url)
+                st.toast(f"Uploaded {file.name}")
+                break
+            except Exception as e:
+                if attempt == 2:
+                    st.error(f"Failed to upload {file.name} after 3 attempts: {type(e).__name__} – {str(e)}")
+                else:
+                    time.sleep(1.5 * (attempt + 1))
+                    st.info(f"Retrying upload for {file.name} (attempt {attempt+2}/3)...")
+
+    return urls
+
+
+def delete_image_from_storage(url):
+    """Removes a single public image URL's file from the bucket, ignoring failures."""
+    try:
+        parsed = urllib.parse.urlparse(url)
+        full_path = parsed.path.lstrip('/')
+        prefix = f"storage/v1/object/public/{BUCKET_NAME}/"
+        if full_path.startswith(prefix):
+            file_path = full_path[len(prefix):]
+            get_client().storage.from_(BUCKET_NAME).remove([file_path])
+            perf.count("storage.remote_calls")
+            get_photo_cache().discard(url)
+    except:
+        pass
@@ -0,0 +1,184 @@
+import gc
+import sys
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from operator import itemgetter
+
+VISITED_DATE_FORMAT = "%B %d, %Y"
+
+_UNPARSED = (None, None)
+_intern = sys.intern
+
+
+def normalize_reviews(reviews):
+    """Cleans notes stored as strings or legacy {"comment": ...} dicts, dropping blanks."""
+    if not reviews:
+        return ()
+    normalized = []
+    for rev in reviews:
+        if rev:
+            if isinstance(rev, str):
+                cleaned = rev.strip()
+            elif isinstance(rev, dict) and "comment" in rev:
+                cleaned = str(rev["comment"]).strip()
+            else:
+                cleaned = ""
+            if cleaned:
+                normalized.append(cleaned)
+    return tuple(normalized)
+
+
+@dataclass(slots=True, eq=False)
+class Place:
+    """One row of the ``restaurants`` table.
+
+    Categorical fields (cuisine, price, location, type) are interned so
+    every place shares the same string objects, notes and photos are kept
+    as tuples, and the two date strings are only parsed when a view asks
+    for them. Equality is identity, so ``list.index`` and ``in`` checks
+    find the exact record a view is showing.
+    """
+
+    name: str
+    cuisine: str
+    price: str
+    location: str
+    address: str
+    type: str
+    favorite: bool = False
+    visited: bool = False
+    visited_date: str | None = None
+    reviews: tuple = ()
+    images: tuple = ()
+    latitude: float | None = None
+    longitude: float | None = None
+    retired: bool = False
+    created_at: str | None = None
+    id: int | None = None
+    _created: tuple = field(default=_UNPARSED, init=False, repr=False)
+    _visited_on: tuple = field(default=_UNPARSED, init=False, repr=False)
+
+    def __post_init__(self):
+        self.cuisine = _intern(self.cuisine)
+        self.price = _intern(self.price)
+        self.location = _intern(self.location)
+        self.type = _intern(self.type)
+        self.reviews = tuple(self.reviews)
+        self.images = tuple(self.images)
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds a Place from a Supabase row, filling columns older rows lack."""
+        # Hot path for load_data: fill the slots directly instead of going through
+        # __init__/__post_init__, which costs ~2x at 100k rows, and fetch every
+        # column in one itemgetter call unless the row lacks some.
+        place = _new(cls)
+        try:
+            values = _row_values(row)
+        except KeyError:
+            values = _row_values({**_ROW_DEFAULTS, **row})
+        (name, cuisine, price, location, address, type_, favorite, visited, place.visited_date, reviews,
+         images, place.latitude, place.longitude, retired, place.created_at, place.id) = values
+        # Missing or null text columns become "", so one bad row can't fail the whole load.
+        place.name = name or ""
+        place.cuisine = _intern(cuisine or "")
+        place.price = _intern(price or "")
+        place.location = _intern(location or "")
+        place.address = address or ""
+        place.type = _intern(type_ or "")
+        place.favorite = favorite or False
+        place.visited = visited or False
+        place.reviews = normalize_reviews(reviews) if reviews else ()
+        place.images = tuple(images) if images else ()
+        place.retired = retired or False
+        place._created = place._visited_on = _UNPARSED
+        return place
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Replaces each Supabase row in the list ``rows`` with its Place and returns the list.
+
+        Each row dict is freed as soon as its Place is built, so a full load
+        never holds both, and the cyclic GC is paused meanwhile: Places hold
+        no cycles, but 100k new objects would set off collections that scan
+        them all repeatedly for nothing.
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            from_row = cls.from_row
+            for i, row in enumerate(rows):
+                rows[i] = from_row(row)
+        finally:
+            if enabled:
+                gc.enable()
+        return rows
+
+    def to_row(self):
+        """Returns the column dict save_data writes; created_at is left to the DB when unset."""
+        row = {
+            "name": self.name,
+            "cuisine": self.cuisine,
+            "price": self.price,
+            "location": self.location,
+            "address": self.address,
+            "type": self.type,
+            "favorite": self.favorite,
+            "visited": self.visited,
+            "visited_date": self.visited_date,
+            "reviews": list(self.reviews),
+            "images": list(self.images),
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "retired": self.retired,
+        }
+        if self.created_at is not None:
+            row["created_at"] = self.created_at
+        return row
+
+    def update(self, **fields):
+        """Sets several columns at once, re-interning categorical fields."""
+        for key, value in fields.items():
+            setattr(self, key, value)
+        self.__post_init__()
+
+    def refresh(self, other):
+        """Copies every column from ``other`` into this record, keeping its identity."""
+        for f in _COLUMNS:
+            setattr(self, f, getattr(other, f))
+        self._created = self._visited_on = _UNPARSED
+
+    @property
+    def created(self):
+        """created_at as a naive datetime (datetime.min when unknown), parsed once."""
+        raw, parsed = self._created
+        if raw is not self.created_at or parsed is None:
+            parsed = datetime.min
+            if self.created_at:
+                parsed = datetime.fromisoformat(self.created_at).replace(tzinfo=None)
+            self._created = (self.created_at, parsed)
+        return parsed
+
+    @property
+    def visited_on(self):
+        """visited_date as a date, or None when missing or unparseable."""
+        raw, parsed = self._visited_on
+        if raw is not self.visited_date:
+            parsed = None
+            if self.visited_date:
+                try:
+                    parsed = datetime.strptime(self.visited_date, VISITED_DATE_FORMAT).date()
+                except ValueError:
+                    pass
+            self._visited_on = (self.visited_date, parsed)
+        return parsed
+
+    def set_visited_on(self, visited_on: date | None):
+        self.visited_date = visited_on.strftime(VISITED_DATE_FORMAT) if visited_on else None
+
+
+_new = object.__new__
+_COLUMNS = tuple(f.name for f in fields(Place) if not f.name.startswith("_"))
+_row_values = itemgetter(*_COLUMNS)
+# For rows lacking columns; from_row maps missing and null values to the same defaults.
+_ROW_DEFAULTS = dict.fromkeys(_COLUMNS)
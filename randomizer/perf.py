@@ -0,0 +1,204 @@
+"""Lightweight timing, counters and memory snapshots for the app's hot paths.
+
+Disabled unless the ``RANDOMIZER_PERF`` environment variable is set to a
+truthy value; when disabled ``timed`` wrappers and ``span`` cost a single
+flag check. Samples are kept process-wide in bounded deques so the admin
+dashboard can show rolling percentiles across sessions.
+"""
+import functools
+import json
+import os
+import resource
+import secrets
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get("RANDOMIZER_PERF", "").lower() in ("1", "true", "yes")
+MAX_SAMPLES = 1000
+MAX_RERUNS = 50
+
+_lock = threading.Lock()
+_local = threading.local()
+_durations = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_counters = defaultdict(int)
+_reruns = deque(maxlen=MAX_RERUNS)
+_NULL_SPAN = nullcontext()
+
+
+def set_enabled(enabled):
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+def reset():
+    with _lock:
+        _durations.clear()
+        _counters.clear()
+        _reruns.clear()
+
+
+def _now_ns():
+    return time.time_ns()
+
+
+@contextmanager
+def _record(name, attributes):
+    stack = getattr(_local, "stack", None)
+    spans = getattr(_local, "spans", None)
+    span = {
+        "span_id": secrets.token_hex(8),
+        "parent_id": stack[-1]["span_id"] if stack else None,
+        "name": name,
+        "start_ns": _now_ns(),
+        "attributes": dict(attributes),
+    }
+    if stack is not None:
+        stack.append(span)
+    start = time.perf_counter()
+    try:
+        yield span
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        span["end_ns"] = span["start_ns"] + int(elapsed_ms * 1e6)
+        span["duration_ms"] = elapsed_ms
+        if stack is not None:
+            stack.pop()
+        if spans is not None:
+            spans.append(span)
+        with _lock:
+            _durations[name].append(elapsed_ms)
+
+
+def span(name, **attributes):
+    """Context manager timing the enclosed block under ``name``."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _record(name, attributes)
+
+
+def timed(name=None):
+    """Decorator timing every call of the wrapped function."""
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _record(label, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Adds ``n`` to the named counter (remote calls, bytes moved, ...)."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] += n
+
+
+def memory_snapshot():
+    """Peak RSS in KB, plus tracemalloc current/peak when tracing is on."""
+    snap = {"max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        snap["traced_current_kb"] = current // 1024
+        snap["traced_peak_kb"] = peak // 1024
+    return snap
+
+
+@contextmanager
+def rerun(view):
+    """Collects every span recorded during one script run into a rerun record."""
+    if not ENABLED:
+        yield
+        return
+    _local.trace_id = secrets.token_hex(16)
+    _local.stack = []
+    _local.spans = []
+    try:
+        with _record("rerun", {"view": view}):
+            yield
+    finally:
+        record = {
+            "trace_id": _local.trace_id,
+            "view": view,
+            "spans": _local.spans,
+            "memory": memory_snapshot(),
+        }
+        _local.stack = _local.spans = None
+        with _lock:
+            _reruns.append(record)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def summary():
+    """Returns per-operation count and p50/p95/p99 over the rolling window."""
+    with _lock:
+        samples = {name: sorted(values) for name, values in _durations.items()}
+    rows = []
+    for name, values in sorted(samples.items()):
+        rows.append({
+            "operation": name,
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+        })
+    return rows
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def recent_reruns():
+    with _lock:
+        return list(_reruns)
+
+
+def _otlp_attributes(attributes):
+    return [{"key": k, "value": {"stringValue": str(v)}} for k, v in attributes.items()]
+
+
+def export_otlp():
+    """Recent reruns as an OTLP/JSON ``resourceSpans`` document."""
+    spans = []
+    for record in recent_reruns():
+        for s in record["spans"]:
+            spans.append({
+                "traceId": record["trace_id"],
+                "spanId": s["span_id"],
+                "parentSpanId": s["parent_id"] or "",
+                "name": s["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(s["start_ns"]),
+                "endTimeUnixNano": str(s["end_ns"]),
+                "attributes": _otlp_attributes(s["attributes"]),
+            })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": "chicago-restaurant-randomizer"})},
+            "scopeSpans": [{"scope": {"name": "randomizer.perf"}, "spans": spans}],
+        }],
+        "summary": summary(),
+        "counters": counters(),
+    }
+
+
+def export_json(path):
+    with open(path, "w") as f:
+        json.dump(export_otlp(), f, indent=2)
+    return path
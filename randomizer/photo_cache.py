@@ -0,0 +1,338 @@
+"""Local LRU cache for restaurant photos.
+
+Photos are downloaded from the Supabase bucket once, kept under
+``static/photos/`` and handed to browsers as ``/app/static/photos/...``
+URLs. Streamlit's static file server answers those straight from disk, with
+Range support and the ETag/Last-Modified headers browsers cache by, so
+viewers stop pulling every photo from the bucket. Misses are fetched on a
+background thread (the page shows the bucket URL until the next rerun),
+cached copies are revalidated with ``If-None-Match`` once a day, and the
+least recently used files are evicted past ``MAX_DISK_BYTES``. The hottest
+photos are also kept in memory for when static serving is off and the bytes
+have to go through ``st.image`` instead.
+"""
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict, deque
+
+import streamlit as st
+
+from randomizer import perf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Streamlit serves <app dir>/static/ at /app/static/ when server.enableStaticServing is on.
+CACHE_DIR = os.path.join(ROOT, "static", "photos")
+INDEX_PATH = os.path.join(ROOT, "data", "photo_cache.json")
+STATIC_URL = "/app/static/photos/"
+
+MAX_DISK_BYTES = int(os.environ.get("RANDOMIZER_PHOTO_CACHE_MB", "512")) * 1024 * 1024
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+REVALIDATE_SECONDS = 24 * 3600
+RETRY_SECONDS = 300
+FETCH_TIMEOUT = 15
+FETCH_WORKERS = 4
+MAX_SERVE_SAMPLES = 1000
+EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+
+def cache_name(url):
+    """Stable file name for a photo URL, keeping its extension so it's served with the right type."""
+    ext = os.path.splitext(url.split("?", 1)[0])[1].lower()
+    if ext not in EXTENSIONS:
+        ext = ".jpg"
+    return hashlib.sha1(url.encode()).hexdigest()[:24] + ext
+
+
+class PhotoCache:
+    """Size-bounded disk + memory LRU of bucket photos, safe to share across sessions."""
+
+    def __init__(self, directory=None, index_path=None, max_bytes=MAX_DISK_BYTES, max_memory=MAX_MEMORY_BYTES,
+                 opener=None):
+        self.directory = directory or CACHE_DIR
+        self.index_path = index_path or INDEX_PATH
+        self.max_bytes = max_bytes
+        self.max_memory = max_memory
+        self.opener = opener or urllib.request.build_opener()
+        self.entries = OrderedDict()  # url -> {"name", "etag", "size", "checked"}, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0  # 304s: our copy was still current
+        self.refetched = 0    # 200s on revalidation: the object changed
+        self.evictions = 0
+        self.errors = 0
+        self.bytes_fetched = 0
+        self.bytes_saved = 0
+        self._memory = OrderedDict()  # url -> bytes, for the st.image fallback
+        self._memory_bytes = 0
+        self._pending = set()
+        self._failed = {}  # url -> time of the last failed fetch
+        self._serve_ms = deque(maxlen=MAX_SERVE_SAMPLES)
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # serializes index writes, which happen outside _lock
+        self._version = 0        # bumped on every index snapshot
+        self._saved_version = 0  # version of the snapshot on disk
+        self._queue = queue.Queue()
+        self._workers = []
+        self._load_index()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def src(self, url, static=True):
+        """What to show for ``url``: its local static URL (or bytes when ``static`` is off) once cached.
+
+        A miss returns ``url`` unchanged and queues a background fetch; a stale
+        hit is served as-is while it's revalidated in the background.
+        """
+        start = time.perf_counter()
+        result = url
+        entry = self.entries.get(url)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            self._schedule(url)
+        else:
+            with self._lock:
+                if url in self.entries:
+                    self.entries.move_to_end(url)
+                self.hits += 1
+                # Bucket egress this view would have cost without the cache.
+                self.bytes_saved += entry["size"]
+            if time.time() - entry["checked"] > REVALIDATE_SECONDS:
+                self._schedule(url)
+            if static:
+                result = STATIC_URL + entry["name"]
+            else:
+                result = self.read(url) or url
+        self._serve_ms.append((time.perf_counter() - start) * 1000)
+        return result
+
+    def peek(self, url):
+        """The local static URL for ``url`` if it's cached, else ``url``, without fetching or counting a view.
+
+        For links the browser may never follow, such as map popups: a miss
+        queues nothing, and a hit neither counts towards the stats nor
+        refreshes the entry's LRU position.
+        """
+        entry = self.entries.get(url)
+        return url if entry is None else STATIC_URL + entry["name"]
+
+    def read(self, url):
+        """The cached bytes for ``url``, from memory when hot, or None when it isn't cached."""
+        with self._lock:
+            data = self._memory.get(url)
+            if data is not None:
+                self._memory.move_to_end(url)
+                return data
+            entry = self.entries.get(url)
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(self.directory, entry["name"]), "rb") as f:
+                data = f.read()
+        except OSError:
+            self.discard(url)
+            return None
+        with self._lock:
+            if url in self.entries and len(data) <= self.max_memory:
+                self._memory[url] = data
+                self._memory_bytes += len(data)
+                while self._memory_bytes > self.max_memory:
+                    _, old = self._memory.popitem(last=False)
+                    self._memory_bytes -= len(old)
+        return data
+
+    @perf.timed("photos.fetch")
+    def fetch(self, url):
+        """Downloads ``url`` into the cache, or revalidates the cached copy with its ETag."""
+        entry = self.entries.get(url)
+        headers = {"If-None-Match": entry["etag"]} if entry and entry["etag"] else {}
+        try:
+            with self.opener.open(urllib.request.Request(url, headers=headers), timeout=FETCH_TIMEOUT) as response:
+                data = response.read()
+                etag = response.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or entry is None:
+                raise
+            with self._lock:
+                entry["checked"] = time.time()
+                self.revalidated += 1
+                self.bytes_saved += entry["size"]
+            self._save_index()
+            return
+        perf.count("storage.remote_calls")
+        self._store(url, data, etag, replaced=entry is not None)
+
+    def discard(self, url):
+        """Drops ``url`` from the cache, e.g. after the photo was deleted from the bucket."""
+        with self._lock:
+            entry = self.entries.pop(url, None)
+            if entry is None:
+                return
+            self._drop(url, entry)
+        self._remove_files([entry])
+        self._save_index()
+
+    def wait(self):
+        """Blocks until every queued fetch has finished."""
+        self._queue.join()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        samples = sorted(self._serve_ms)
+        return {
+            "entries": len(self.entries),
+            "disk_bytes": self.total_bytes,
+            "memory_bytes": self._memory_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "revalidated": self.revalidated,
+            "refetched": self.refetched,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "bytes_fetched": self.bytes_fetched,
+            "bytes_saved": self.bytes_saved,
+            "p95_serve_ms": round(samples[int(0.95 * (len(samples) - 1))], 4) if samples else None,
+        }
+
+    def _schedule(self, url):
+        if not url.startswith(("http://", "https://")):
+            return
+        with self._lock:
+            if url in self._pending or time.time() - self._failed.get(url, 0) < RETRY_SECONDS:
+                return
+            self._pending.add(url)
+            if not self._workers:
+                # Daemon threads, so a backlog of fetches never holds up shutdown.
+                for i in range(FETCH_WORKERS):
+                    worker = threading.Thread(target=self._work, name=f"photo-cache-{i}", daemon=True)
+                    worker.start()
+                    self._workers.append(worker)
+        self._queue.put(url)
+
+    def _work(self):
+        while True:
+            url = self._queue.get()
+            try:
+                self.fetch(url)
+                self._failed.pop(url, None)
+            except (OSError, ValueError):
+                # URLError/HTTPError are OSErrors; back off instead of retrying every rerun.
+                with self._lock:
+                    self.errors += 1
+                    self._failed[url] = time.time()
+            finally:
+                with self._lock:
+                    self._pending.discard(url)
+                self._queue.task_done()
+
+    def _store(self, url, data, etag, replaced=False):
+        name = cache_name(url)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(self.directory, name))
+        with self._lock:
+            old = self.entries.pop(url, None)
+            if old is not None:
+                self.total_bytes -= old["size"]
+                self._forget(url)
+            self.entries[url] = {"name": name, "etag": etag, "size": len(data), "checked": time.time()}
+            self.total_bytes += len(data)
+            self.bytes_fetched += len(data)
+            if replaced:
+                self.refetched += 1
+            evicted = []
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_url, old = self.entries.popitem(last=False)
+                self._drop(old_url, old)
+                evicted.append(old)
+            self.evictions += len(evicted)
+        self._remove_files(evicted)
+        self._save_index()
+
+    def _drop(self, url, entry):
+        """Unaccounts a popped entry; its file is removed by the caller once ``_lock`` is released."""
+        self.total_bytes -= entry["size"]
+        self._forget(url)
+
+    def _remove_files(self, entries):
+        for entry in entries:
+            try:
+                os.remove(os.path.join(self.directory, entry["name"]))
+            except OSError:
+                pass
+
+    def _forget(self, url):
+        data = self._memory.pop(url, None)
+        if data is not None:
+            self._memory_bytes -= len(data)
+
+    def _load_index(self):
+        """Restores the entries (in LRU order) whose files are still on disk."""
+        try:
+            with open(self.index_path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for url, name, etag, size, checked in saved:
+            try:
+                if os.path.getsize(os.path.join(self.directory, name)) != size:
+                    continue
+            except OSError:
+                continue
+            self.entries[url] = {"name": name, "etag": etag, "size": size, "checked": checked}
+            self.total_bytes += size
+
+    def _save_index(self):
+        """Writes the index from a snapshot; called without ``_lock`` held so src() never waits on the disk."""
+        with self._lock:
+            self._version += 1
+            version = self._version
+            saved = [[url, e["name"], e["etag"], e["size"], e["checked"]] for url, e in self.entries.items()]
+        with self._save_lock:
+            if version < self._saved_version:
+                return  # a newer snapshot is already on disk
+            directory = os.path.dirname(self.index_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(saved, f)
+            os.replace(tmp, self.index_path)
+            self._saved_version = version
+
+
+@st.cache_resource(show_spinner=False)
+def get_photo_cache():
+    """The process-wide photo cache, restored from its index on first use."""
+    return PhotoCache()
+
+
+def static_serving():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def photo_resolver(html=False):
+    """Returns ``url -> source`` for a view's photos, looking the cache up once per render.
+
+    Sources are local static URLs, cached bytes when static serving is off, or
+    the bucket URL on a miss. With ``html`` they are always URLs, for raw HTML
+    such as map popups that can't take bytes, and come from ``peek``: the
+    browser only loads a popup's photo when the marker is clicked, so those
+    lookups neither queue downloads nor count as views.
+    """
+    static = static_serving()
+    if html:
+        return get_photo_cache().peek if static else lambda url: url
+    cache = get_photo_cache()
+    return lambda url: cache.src(url, static=static)
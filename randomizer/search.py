@@ -0,0 +1,290 @@
+"""BM25 full-text index over place notes.
+
+Each note is a document with an integer id. The index is updated per place
+as notes are added, edited or deleted, and persisted to
+``data/notes_index.bin`` with a per-place fingerprint so a restart only
+re-indexes places whose notes changed since the file was written.
+"""
+import heapq
+import marshal
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+import zlib
+
+import numpy as np
+import streamlit as st
+
+from randomizer import perf
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "notes_index.bin")
+# marshal's format is tied to the interpreter, so the file is only reused by the same version.
+INDEX_VERSION = (2, sys.version_info[:2])
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have i if in is it its of on or so that the "
+    "their them then there they this to too was we were what when with you your".split()
+)
+K1 = 1.2
+B = 0.75
+SNIPPET_CHARS = 140
+# Candidate notes pulled per requested place, so places with several matching notes don't crowd others out.
+CANDIDATES_PER_RESULT = 8
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def fingerprint(notes):
+    return zlib.crc32("\x1f".join(notes).encode())
+
+
+class NoteIndex:
+    """Inverted index of note terms with BM25 ranking, safe to share across sessions."""
+
+    def __init__(self):
+        self.postings = {}    # term -> {doc id: term frequency}
+        self.docs = []        # doc id -> (place id, note number, length), None once removed
+        self.doc_terms = {}   # doc id -> terms, so removals only touch those postings
+        self.place_docs = {}  # place id -> (fingerprint, [doc ids])
+        self._restored = set()  # place ids read from disk that no load or feed event has confirmed yet
+        self.total_len = 0
+        self.live_docs = 0
+        self.dirty = False
+        self._lock = threading.RLock()
+        self._arrays = {}     # term -> (doc ids, tfs) as numpy arrays, dropped when the term changes
+        self._lengths = None  # numpy doc lengths (0 for removed docs) with spare capacity, rebuilt after _compact
+
+    def __len__(self):
+        return self.live_docs
+
+    def _remove_docs(self, doc_ids):
+        for doc in doc_ids:
+            _, _, length = self.docs[doc]
+            self.docs[doc] = None
+            self.total_len -= length
+            self.live_docs -= 1
+            if self._lengths is not None:
+                self._lengths[doc] = 0
+            for term in self.doc_terms.pop(doc):
+                plist = self.postings[term]
+                del plist[doc]
+                if not plist:
+                    del self.postings[term]
+                self._arrays.pop(term, None)
+
+    def update_place(self, place_id, notes):
+        """(Re)indexes one place's notes; a no-op when they haven't changed."""
+        if place_id is None:
+            return
+        notes = tuple(notes)
+        fp = fingerprint(notes)
+        with self._lock:
+            self._restored.discard(place_id)
+            current = self.place_docs.get(place_id)
+            if current and current[0] == fp:
+                return
+            if current:
+                self._remove_docs(current[1])
+            doc_ids = []
+            for n, note in enumerate(notes):
+                tokens = tokenize(note)
+                if not tokens:
+                    continue
+                doc = len(self.docs)
+                counts = {}
+                for t in tokens:
+                    counts[t] = counts.get(t, 0) + 1
+                for t, tf in counts.items():
+                    self.postings.setdefault(t, {})[doc] = tf
+                    self._arrays.pop(t, None)
+                self.docs.append((place_id, n, len(tokens)))
+                self._set_length(doc, len(tokens))
+                self.doc_terms[doc] = tuple(counts)
+                self.total_len += len(tokens)
+                self.live_docs += 1
+                doc_ids.append(doc)
+            self.place_docs[place_id] = (fp, doc_ids)
+            self.dirty = True
+
+    def remove_place(self, place_id):
+        with self._lock:
+            self._restored.discard(place_id)
+            current = self.place_docs.pop(place_id, None)
+            if current:
+                self._remove_docs(current[1])
+                self.dirty = True
+
+    @perf.timed("search.sync")
+    def sync(self, places):
+        """Indexes new places and re-indexes changed ones from a freshly loaded ``places``.
+
+        Places missing from ``places`` are kept: the snapshot may predate a
+        place another session just added, so removals come from the change
+        feed's DELETE events. The one exception is entries restored from disk
+        that this snapshot doesn't have, which were deleted while the app was
+        down.
+        """
+        with self._lock:
+            for p in places:
+                self.update_place(p.id, p.reviews)
+            for place_id in list(self._restored):
+                self.remove_place(place_id)
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        # Holes cost little until they outnumber live notes; compacting drops every cached array.
+        if len(self.docs) > 2 * self.live_docs + 1000:
+            self._compact()
+
+    def _compact(self):
+        """Renumbers docs to drop the holes left by removed notes."""
+        remap = {}
+        docs = []
+        for old, doc in enumerate(self.docs):
+            if doc is not None:
+                remap[old] = len(docs)
+                docs.append(doc)
+        self.docs = docs
+        self.postings = {t: {remap[d]: tf for d, tf in plist.items()} for t, plist in self.postings.items()}
+        self.doc_terms = {remap[d]: terms for d, terms in self.doc_terms.items()}
+        self.place_docs = {pid: (fp, [remap[d] for d in ids]) for pid, (fp, ids) in self.place_docs.items()}
+        self._arrays.clear()
+        self._lengths = None
+
+    def _term_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            plist = self.postings.get(term)
+            if not plist:
+                return None
+            arrays = (np.fromiter(plist.keys(), np.int64, len(plist)),
+                      np.fromiter(plist.values(), np.float64, len(plist)))
+            self._arrays[term] = arrays
+        return arrays
+
+    def _set_length(self, doc, length):
+        if self._lengths is None:
+            return
+        if doc >= len(self._lengths):
+            self._lengths = np.concatenate([self._lengths, np.zeros(max(len(self._lengths), 1024), np.float64)])
+        self._lengths[doc] = length
+
+    def _doc_lengths(self):
+        if self._lengths is None:
+            self._lengths = np.fromiter((d[2] if d else 0 for d in self.docs), np.float64, len(self.docs))
+        return self._lengths[:len(self.docs)]
+
+    @perf.timed("search.query")
+    def search(self, query, limit=50):
+        """Returns [(place_id, score, note_number)] ranked by the best-scoring note per place."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            if not self.live_docs:
+                return []
+            n_docs = self.live_docs
+            avgdl = self.total_len / n_docs
+            lengths = self._doc_lengths()
+            ids, weights = [], []
+            for term in terms:
+                arrays = self._term_arrays(term)
+                if arrays is None:
+                    continue
+                doc_ids, tfs = arrays
+                idf = math.log(1 + (n_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                norm = K1 * (1 - B + B * lengths[doc_ids] / avgdl)
+                ids.append(doc_ids)
+                weights.append(idf * tfs * (K1 + 1) / (tfs + norm))
+            if not ids:
+                return []
+            scores = np.bincount(np.concatenate(ids), weights=np.concatenate(weights), minlength=len(self.docs))
+            hits = np.flatnonzero(scores)
+            k = min(len(hits), limit * CANDIDATES_PER_RESULT)
+            top = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+            ranked = [(float(scores[d]), self.docs[d]) for d in top]
+        results = {}
+        for score, (place_id, n, _) in heapq.nlargest(len(ranked), ranked, key=lambda item: item[0]):
+            if place_id not in results:
+                results[place_id] = (place_id, score, n)
+                if len(results) == limit:
+                    break
+        return list(results.values())
+
+    @perf.timed("search.save")
+    def save(self, path=None):
+        """Atomically writes the index if it changed since the last save."""
+        path = path or INDEX_PATH
+        with self._lock:
+            if not self.dirty:
+                return False
+            self._maybe_compact()
+            data = marshal.dumps((INDEX_VERSION, self.postings, self.docs, self.doc_terms, self.place_docs))
+            self.dirty = False
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return True
+
+    def save_async(self, path=None):
+        """Saves on a background thread so edits don't wait on the disk write."""
+        if self.dirty:
+            threading.Thread(target=self.save, args=(path,), daemon=True).start()
+
+    @classmethod
+    @perf.timed("search.load")
+    def load(cls, path=None):
+        """Reads a saved index, or returns an empty one if the file is missing or stale."""
+        index = cls()
+        try:
+            with open(path or INDEX_PATH, "rb") as f:
+                version, postings, docs, doc_terms, place_docs = marshal.loads(f.read())
+        except (OSError, ValueError, EOFError, TypeError):
+            return index
+        if version != INDEX_VERSION:
+            return index
+        index.postings = postings
+        index.docs = docs
+        index.doc_terms = doc_terms
+        index.place_docs = place_docs
+        index._restored = set(place_docs)
+        live = [d for d in docs if d is not None]
+        index.live_docs = len(live)
+        index.total_len = sum(d[2] for d in live)
+        return index
+
+
+@st.cache_resource(show_spinner=False)
+def get_note_index():
+    """The process-wide note index, loaded from disk on first use."""
+    return NoteIndex.load()
+
+
+def highlight(note, query, width=SNIPPET_CHARS):
+    """Returns a markdown snippet of ``note`` around the first query term, terms in bold."""
+    terms = set(tokenize(query))
+    matches = [m for m in TOKEN_RE.finditer(note.lower()) if m.group() in terms]
+    if not matches:
+        return note[:width]
+    start = max(0, matches[0].start() - width // 3)
+    end = min(len(note), start + width)
+    pieces = []
+    pos = start
+    for m in matches:
+        if m.start() < start or m.end() > end:
+            continue
+        pieces.append(note[pos:m.start()])
+        pieces.append(f"**{note[m.start():m.end()]}**")
+        pos = m.end()
+    pieces.append(note[pos:end])
+    snippet = "".join(pieces)
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(note) else "")
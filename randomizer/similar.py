@@ -0,0 +1,215 @@
+"""Nearest-neighbour "places like this" over a NumPy feature matrix.
+
+Each place is one float32 row made of weighted, unit-length blocks:
+cuisine, neighborhood and type one-hots, price as an angle (so $$ is
+closer to $$$ than to $$$$), coordinates as random Fourier features (so
+the dot product approximates a Gaussian kernel on distance) and hashed note
+keywords. The dot product of two rows is then the weighted sum of the
+per-block similarities, and a query is one matrix-vector product over
+every row. Rows are updated in place as places are added, edited or
+deleted, like the notes index.
+"""
+import math
+import threading
+import zlib
+
+import numpy as np
+import streamlit as st
+
+from randomizer import perf
+from randomizer.constants import CUISINES, NEIGHBORHOODS, PLACE_TYPES, PRICES
+from randomizer.search import tokenize
+
+# Block weights: how much sharing each attribute counts towards "like this".
+WEIGHTS = {"cuisine": 3.0, "location": 1.5, "type": 1.0, "price": 1.0, "geo": 1.5, "notes": 1.0}
+GEO_FEATURES = 32
+GEO_SCALE_KM = 3.0
+NOTE_FEATURES = 32
+CHICAGO = (41.8781, -87.6298)
+KM_PER_LAT = 110.57
+KM_PER_LON = 111.32 * math.cos(math.radians(CHICAGO[0]))
+DEFAULT_LIMIT = 5
+
+_CUISINES = {c: i for i, c in enumerate(CUISINES)}
+_LOCATIONS = {n: i for i, n in enumerate(NEIGHBORHOODS)}
+_TYPES = {t: i for i, t in enumerate(PLACE_TYPES)}
+_PRICES = {p: i for i, p in enumerate(PRICES)}
+
+# Column layout; the extra column in the one-hots collects values outside the constants.
+_BLOCKS = {}
+_offset = 0
+for _name, _width in (("cuisine", len(CUISINES) + 1), ("location", len(NEIGHBORHOODS) + 1),
+                      ("type", len(PLACE_TYPES) + 1), ("price", 2), ("geo", GEO_FEATURES),
+                      ("notes", NOTE_FEATURES)):
+    _BLOCKS[_name] = slice(_offset, _offset + _width)
+    _offset += _width
+DIM = _offset
+TOTAL_WEIGHT = sum(WEIGHTS.values())
+
+# Fixed projection so rows encoded at different times stay comparable.
+_rng = np.random.default_rng(20240601)
+_GEO_W = (_rng.normal(size=(2, GEO_FEATURES)) / GEO_SCALE_KM).astype(np.float32)
+_GEO_B = _rng.uniform(0, 2 * np.pi, GEO_FEATURES).astype(np.float32)
+
+
+class _NoteColumns(dict):
+    """term -> hashed note feature; crc32 rather than hash() so it's stable across restarts."""
+
+    def __missing__(self, term):
+        col = self[term] = zlib.crc32(term.encode()) % NOTE_FEATURES
+        return col
+
+
+_note_columns = _NoteColumns()
+
+
+def _one_hot(out, block, lookup, values):
+    cols = np.fromiter((lookup.get(v, len(lookup)) for v in values), np.int64, len(values))
+    out[np.arange(len(values)), _BLOCKS[block].start + cols] = math.sqrt(WEIGHTS[block])
+
+
+def encode(places):
+    """Returns the (len(places), DIM) float32 feature rows for ``places``."""
+    n = len(places)
+    out = np.zeros((n, DIM), np.float32)
+    if not n:
+        return out
+    _one_hot(out, "cuisine", _CUISINES, [p.cuisine for p in places])
+    _one_hot(out, "location", _LOCATIONS, [p.location for p in places])
+    _one_hot(out, "type", _TYPES, [p.type for p in places])
+
+    price = np.fromiter((_PRICES.get(p.price, -1) for p in places), np.float32, n)
+    angle = price * (np.pi / 2 / (len(PRICES) - 1))
+    known = (price >= 0) * math.sqrt(WEIGHTS["price"])
+    out[:, _BLOCKS["price"]] = np.stack([np.cos(angle), np.sin(angle)], axis=1) * known[:, None]
+
+    lat = np.fromiter((p.latitude if p.latitude is not None else np.nan for p in places), np.float32, n)
+    lon = np.fromiter((p.longitude if p.longitude is not None else np.nan for p in places), np.float32, n)
+    mapped = ~(np.isnan(lat) | np.isnan(lon))
+    km = np.stack([(lat[mapped] - CHICAGO[0]) * KM_PER_LAT, (lon[mapped] - CHICAGO[1]) * KM_PER_LON], axis=1)
+    geo = np.cos(km @ _GEO_W + _GEO_B)
+    geo /= np.linalg.norm(geo, axis=1, keepdims=True)
+    out[np.flatnonzero(mapped), _BLOCKS["geo"]] = geo * math.sqrt(WEIGHTS["geo"])
+
+    notes = _BLOCKS["notes"]
+    cols = []
+    lengths = []
+    for p in places:
+        terms = tokenize(" ".join(p.reviews)) if p.reviews else ()
+        lengths.append(len(terms))
+        cols.extend(map(_note_columns.__getitem__, terms))
+    cells = np.repeat(np.arange(n) * NOTE_FEATURES, lengths) + np.array(cols, np.int64)
+    counts = np.bincount(cells, minlength=n * NOTE_FEATURES).reshape(n, NOTE_FEATURES)
+    block = out[:, notes]
+    np.log1p(counts, out=block, casting="unsafe")
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    np.divide(block, norms, out=block, where=norms > 0)
+    block *= math.sqrt(WEIGHTS["notes"])
+    return out
+
+
+def _signature(place):
+    """The fields that feed the features, so unchanged places are skipped on sync."""
+    return (place.cuisine, place.location, place.type, place.price, place.latitude, place.longitude,
+            place.reviews, place.retired)
+
+
+class SimilarityIndex:
+    """Feature matrix over places keyed by place id, with in-place row updates."""
+
+    def __init__(self, capacity=1024):
+        self.matrix = np.zeros((capacity, DIM), np.float32)
+        self.ids = np.full(capacity, -1, np.int64)
+        # 0 for rows a query may return, -inf for free rows and retired places.
+        self.penalty = np.full(capacity, -np.inf, np.float32)
+        self.rows = {}        # place id -> row
+        self.signatures = {}  # place id -> _signature at the last update
+        self.size = 0         # rows in use, including holes left by removals
+        self._free = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _grow(self, needed):
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        extra = capacity - len(self.ids)
+        self.matrix = np.concatenate([self.matrix, np.zeros((extra, DIM), np.float32)])
+        self.ids = np.concatenate([self.ids, np.full(extra, -1, np.int64)])
+        self.penalty = np.concatenate([self.penalty, np.full(extra, -np.inf, np.float32)])
+
+    def _write(self, places):
+        """Encodes ``places`` into their rows, allocating rows for new ids."""
+        if not places:
+            return
+        vectors = encode(places)
+        with self._lock:
+            self._grow(self.size + len(places))
+            for place, vector in zip(places, vectors):
+                row = self.rows.get(place.id)
+                if row is None:
+                    row = self._free.pop() if self._free else self.size
+                    self.size = max(self.size, row + 1)
+                    self.rows[place.id] = row
+                    self.ids[row] = place.id
+                self.matrix[row] = vector
+                self.penalty[row] = -np.inf if place.retired else 0.0
+                self.signatures[place.id] = _signature(place)
+
+    def update_place(self, place):
+        """(Re)encodes one place; a no-op when none of its features changed."""
+        if place.id is None or self.signatures.get(place.id) == _signature(place):
+            return
+        self._write([place])
+
+    def remove_place(self, place_id):
+        with self._lock:
+            row = self.rows.pop(place_id, None)
+            if row is None:
+                return
+            self.signatures.pop(place_id, None)
+            self.matrix[row] = 0
+            self.ids[row] = -1
+            self.penalty[row] = -np.inf
+            self._free.append(row)
+
+    @perf.timed("similar.sync")
+    def sync(self, places):
+        """Encodes the new or changed places in ``places`` in one batch.
+
+        Places missing from ``places`` are kept, as the snapshot may predate
+        another session's insert; removals come from the change feed.
+        """
+        with self._lock:
+            changed = [p for p in places if p.id is not None and self.signatures.get(p.id) != _signature(p)]
+            self._write(changed)
+
+    @perf.timed("similar.query")
+    def similar(self, place_id, limit=DEFAULT_LIMIT):
+        """Returns [(place_id, similarity in 0..1)] for the places most like ``place_id``, best first."""
+        with self._lock:
+            row = self.rows.get(place_id)
+            if row is None:
+                return []
+            n = self.size
+            scores = self.matrix[:n] @ self.matrix[row]
+            scores += self.penalty[:n]
+            scores[row] = -np.inf
+            k = min(limit, len(self.rows) - 1)
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            ids = self.ids[top]
+            best = scores[top]
+        return [(int(pid), max(0.0, float(s)) / TOTAL_WEIGHT) for pid, s in zip(ids, best) if s > -np.inf]
+
+
+@st.cache_resource(show_spinner=False)
+def get_similarity_index():
+    """The process-wide similarity index; load_data and the change feed keep it current."""
+    return SimilarityIndex()
@@ -0,0 +1,23 @@
+"""One module per sidebar action, each exposing ``render(restaurants)``.
+
+Modules are imported on first use so a rerun only loads the active view.
+"""
+import importlib
+
+VIEWS = {
+    "View All Places": "view_all",
+    "Map View": "map_view",
+    "Add a Place": "add_place",
+    "Random Pick": "random_pick",
+}
+
+# Only offered when perf tracing is enabled and the URL has ``?admin=1``.
+ADMIN_VIEWS = {
+    "Performance": "perf_dashboard",
+}
+
+
+def render_view(action, restaurants):
+    module_name = VIEWS.get(action) or ADMIN_VIEWS[action]
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    module.render(restaurants)
@@ -0,0 +1,72 @@
+from datetime import date
+
+import streamlit as st
+
+from randomizer.constants import CUISINES, NEIGHBORHOODS, PLACE_TYPES, PRICES
+from randomizer.db import save_data
+from randomizer.geo import get_lat_lon
+from randomizer.images import upload_images_to_supabase
+from randomizer.models import Place
+
+
+def render(restaurants):
+    st.header("Add a New Place 📍")
+    name = st.text_input("Name*")
+    cuisine = st.selectbox("Cuisine/Style*", CUISINES)
+    price = st.selectbox("Price*", PRICES)
+    location = st.selectbox("Neighborhood*", NEIGHBORHOODS)
+    address = st.text_input("Address*")
+    place_type = st.selectbox("Type*", PLACE_TYPES,
+                              format_func=lambda x: "Restaurant 🍽️" if x == "restaurant" else "Cocktail Bar 🍸")
+    retired = st.checkbox("😔 Retired?", False)
+    visited = st.checkbox("✅ I've already visited this place")
+    default_date = date.today() if visited else None
+    visited_date = st.date_input("Date Visited", value=default_date) if visited else None
+    uploaded_images = st.file_uploader("Upload photos", type=["png", "jpg", "jpeg", "webp"], accept_multiple_files=True)
+    quick_notes = st.text_area("Quick notes (optional)", height=100)
+
+    if st.button("Add Place", type="primary"):
+        if not all([name.strip(), address.strip()]):
+            st.error("Name and address required")
+        elif any(r.name.lower() == name.lower().strip() for r in restaurants):
+            st.warning("Already exists!")
+        else:
+            lat, lon = None, None
+            with st.spinner(f"Locating '{address}'..."):
+                lat, lon = get_lat_lon(address.strip())
+            if lat is None:
+                st.warning("⚠️ Could not find coordinates. Place will save but won't appear on map.")
+            else:
+                st.toast("✅ Location found!")
+
+            image_urls = []
+            if uploaded_images:
+                with st.spinner("Uploading images..."):
+                    image_urls = upload_images_to_supabase(uploaded_images, name)
+
+            new_reviews = [quick_notes.strip()] if quick_notes.strip() else []
+
+            new = Place(
+                name=name.strip(),
+                cuisine=cuisine,
+                price=price,
+                location=location,
+                address=address.strip(),
+                type=place_type,
+                favorite=False,
+                visited=visited,
+                reviews=new_reviews,
+                images=image_urls,
+                latitude=lat,
+                longitude=lon,
+                retired=retired
+            )
+            new.set_visited_on(visited_date)
+
+            inserted = save_data([new])
+            if inserted:
+                restaurants.append(inserted)
+                st.session_state.success_message = f"{name} added successfully!"
+                st.rerun()
+            else:
+                st.error("Failed to add place.")
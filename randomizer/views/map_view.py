@@ -0,0 +1,97 @@
+import streamlit as st
+
+from randomizer import perf
+from randomizer.geo import google_maps_link
+from randomizer.photo_cache import photo_resolver
+
+LEGEND_HTML = '''
+<div style="position: fixed; top: 10px; right: 10px; width: 120px; height: auto; max-height: 300px; overflow-y: auto;
+            border: 2px solid black; z-index: 9999; font-size: 12px; background-color: white; opacity: 0.9;
+            padding: 0px; border-radius: 5px; color: black;">
+    <details>
+        <summary style="cursor: pointer; padding: 5px; font-weight: bold; background-color: #eee;">Legend 🗺️</summary>
+        <div style="padding: 5px;">
+            <i class="fa fa-map-marker" style="color:blue; font-size:14px;"></i> You<br>
+            <i class="fa fa-map-marker" style="color:green; font-size:14px;"></i> Visited<br>
+            <i class="fa fa-map-marker" style="color:gray; font-size:14px;"></i> Not Visited<br>
+            <hr style="margin: 5px 0;">
+            🍽️ Restaurant<br>
+            🍸 Cocktail Bar
+        </div>
+    </details>
+</div>
+'''
+
+
+@perf.timed("map.marker_rows")
+def marker_rows(restaurants):
+    """Returns (markers, skipped) where markers is a hashable tuple of the fields the map shows."""
+    markers = []
+    skipped = 0
+    photo_url = photo_resolver(html=True)
+    for r in restaurants:
+        if r.retired:
+            skipped += 1
+            continue
+        if r.latitude is not None and r.longitude is not None:
+            markers.append((
+                r.latitude, r.longitude, r.name, r.cuisine, r.price, r.location, r.address,
+                bool(r.visited), r.type, photo_url(r.images[0]) if r.images else None,
+            ))
+        else:
+            skipped += 1
+    return tuple(markers), skipped
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def build_map(markers):
+    """Builds the folium map for a marker tuple; reruns with unchanged places reuse it."""
+    import folium
+    from folium.plugins import LocateControl, MarkerCluster
+
+    m = folium.Map(location=[41.8781, -87.6298], zoom_start=12, tiles="OpenStreetMap")
+    LocateControl(auto_start=False, strings={"title": "Show me where I am", "popup": "You are here!"}).add_to(m)
+    marker_cluster = MarkerCluster().add_to(m)
+    m.get_root().html.add_child(folium.Element(LEGEND_HTML))
+
+    for lat, lon, name, cuisine, price, location, address, visited, place_type, image in markers:
+        color = "green" if visited else "gray"
+        icon_name = "glass" if place_type == "cocktail_bar" else "cutlery"
+        icon_prefix = "glyphicon"
+
+        image_html = ""
+        if image:
+            image_html = f'<img src="{image}" style="width:100%; height:120px; object-fit:cover; border-radius:5px; margin-bottom:8px;">'
+
+        html = f"""
+        <div style="font-family: sans-serif; width: 200px;">
+            {image_html}
+            <h4>{name}</h4>
+            <p><b>{cuisine}</b> • {price}</p>
+            <p>{location}</p>
+            <a href="{google_maps_link(address, name)}" target="_blank">Open in Google Maps</a>
+        </div>
+        """
+
+        folium.Marker(
+            [lat, lon],
+            popup=folium.Popup(html, max_width=250),
+            tooltip=name,
+            icon=folium.Icon(color=color, icon=icon_name, prefix=icon_prefix)
+        ).add_to(marker_cluster)
+    return m
+
+
+def render(restaurants):
+    st.header("Chicago Food Map 🗺️")
+    from streamlit_folium import st_folium
+
+    markers, places_skipped = marker_rows(restaurants)
+    with perf.span("map.build", markers=len(markers)):
+        m = build_map(markers)
+
+    st.caption(f"Showing {len(markers)} location(s).")
+    if places_skipped > 0:
+        st.caption(f"({places_skipped} places hidden due to missing coordinates or retired status)")
+    with perf.span("map.st_folium"):
+        st_folium(m, width="100%", height=600)
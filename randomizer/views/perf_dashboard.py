@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import tracemalloc
+
+import streamlit as st
+
+from randomizer import perf
+from randomizer.photo_cache import get_photo_cache, static_serving
+
+
+def render(restaurants):
+    st.header("Performance 📈")
+    st.caption(f"Rolling window of the last {perf.MAX_SAMPLES} samples per operation, shared by all sessions.")
+
+    summary = perf.summary()
+    if summary:
+        st.dataframe(summary, hide_index=True, use_container_width=True)
+    else:
+        st.info("No timings recorded yet.")
+
+    st.markdown("### Counters")
+    counters = perf.counters()
+    if counters:
+        st.dataframe([{"counter": k, "value": v} for k, v in sorted(counters.items())],
+                     hide_index=True, use_container_width=True)
+    else:
+        st.caption("_No remote calls recorded yet._")
+
+    st.markdown("### Photo cache")
+    photos = get_photo_cache().stats()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Hit rate", f"{photos['hit_rate']:.0%}" if photos["hit_rate"] is not None else "–")
+    c2.metric("Bucket bytes saved", f"{photos['bytes_saved'] / 1e6:,.1f} MB")
+    c3.metric("p95 serve", f"{photos['p95_serve_ms']:.3f} ms" if photos["p95_serve_ms"] is not None else "–")
+    st.json(photos, expanded=False)
+    if not static_serving():
+        st.caption("_Static serving is off, so cached photos are sent through st.image as bytes._")
+
+    st.markdown("### Memory")
+    st.json(perf.memory_snapshot())
+    if tracemalloc.is_tracing():
+        if st.button("Stop tracemalloc"):
+            tracemalloc.stop()
+            st.rerun()
+    elif st.button("Start tracemalloc (adds overhead)"):
+        tracemalloc.start()
+        st.rerun()
+
+    st.markdown("### Recent reruns")
+    for record in reversed(perf.recent_reruns()[-10:]):
+        total = next((s["duration_ms"] for s in record["spans"] if s["name"] == "rerun"), 0.0)
+        with st.expander(f"{record['view']} • {total:.1f} ms • {len(record['spans'])} spans"):
+            st.dataframe(
+                [{"span": s["name"], "ms": round(s["duration_ms"], 2)} for s in record["spans"]],
+                hide_index=True, use_container_width=True,
+            )
+
+    st.markdown("### Export")
+    payload = json.dumps(perf.export_otlp(), indent=2)
+    st.download_button("⬇️ Download OTLP JSON", payload, file_name="randomizer-perf.json",
+                       mime="application/json")
+    if st.button("Write to server temp dir"):
+        path = perf.export_json(os.path.join(tempfile.gettempdir(), "randomizer-perf.json"))
+        st.success(f"Wrote {path}")
+    if st.button("Reset timings"):
+        perf.reset()
+        st.rerun()
@@ -0,0 +1,153 @@
+import random
+import time
+
+import streamlit as st
+
+from randomizer import perf
+from randomizer.constants import VISITED_OPTIONS
+from randomizer.db import toggle_favorite, toggle_visited
+from randomizer.geo import google_maps_link
+from randomizer.photo_cache import photo_resolver
+from randomizer.similar import get_similarity_index
+
+
+@perf.timed("random_pick.filter")
+def filter_places(restaurants, cuisine_filter, location_filter, price_filter, type_filter,
+                  visited_filter, include_retired, only_fav):
+    return [
+        r for r in restaurants
+        if (not only_fav or r.favorite)
+        and (type_filter == "all" or r.type == type_filter)
+        and (not cuisine_filter or r.cuisine in cuisine_filter)
+        and (not price_filter or r.price in price_filter)
+        and (not location_filter or r.location in location_filter)
+        and (visited_filter == "All" or
+             (visited_filter == "Visited Only" and r.visited) or
+             (visited_filter == "Not Visited Yet" and not r.visited))
+        and (include_retired or not r.retired)
+    ]
+
+
+def places_like(restaurants, place):
+    """[(place, similarity)] for the places most like ``place`` that this session has loaded."""
+    matches = get_similarity_index().similar(place.id)
+    wanted = {pid for pid, _ in matches}
+    by_id = {r.id: r for r in restaurants if r.id in wanted}
+    return [(by_id[pid], score) for pid, score in matches if pid in by_id]
+
+
+def render(restaurants):
+    st.header("Random Place Picker 🎲")
+    photo_src = photo_resolver()
+    if not restaurants:
+        st.info("Add places first!")
+    else:
+        with st.container(border=True):
+            st.markdown("### 🕵️ Filter Options")
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                cuisine_filter = st.multiselect("Cuisine", sorted({r.cuisine for r in restaurants}))
+            with c2:
+                location_filter = st.multiselect("Neighborhood", sorted({r.location for r in restaurants}))
+            with c3:
+                price_filter = st.multiselect("Price", sorted({r.price for r in restaurants}, key=len))
+            c4, c5, c6 = st.columns(3)
+            with c4:
+                type_filter = st.selectbox("Type", ["all", "restaurant", "cocktail_bar"],
+                                           format_func=lambda x: {"all": "All", "restaurant": "Restaurants 🍽️", "cocktail_bar": "Bars 🍸"}[x])
+            with c5:
+                visited_filter = st.selectbox("Visited Status", VISITED_OPTIONS)
+            with c6:
+                pass
+            c7, c8, c9 = st.columns(3)
+            with c7:
+                include_retired = st.checkbox("😔 Include Retired?", False)
+            with c8:
+                only_fav = st.checkbox("❤️ Favorites only")
+            with c9:
+                pass
+
+        filtered = filter_places(restaurants, cuisine_filter, location_filter, price_filter, type_filter,
+                                 visited_filter, include_retired, only_fav)
+
+        st.caption(f"**{len(filtered)} places** match your filters")
+
+        if not filtered:
+            st.warning("No matches – try broader filters!")
+        else:
+            if st.button("🎲 Pick Random Place!", type="primary", use_container_width=True):
+                placeholder = st.empty()
+                for _ in range(500):
+                    temp_pick = random.choice(filtered)
+                    placeholder.markdown(f"## 🎲 {temp_pick.name}")
+                    time.sleep(0.01)
+                placeholder.empty()
+                picked = random.choice(filtered)
+                st.session_state.last_pick = picked
+                st.rerun()
+
+            if "last_pick" in st.session_state:
+                c = st.session_state.last_pick
+                if c in filtered:
+                    st.markdown("---")
+                    with st.container(border=True):
+                        tag = " 🍸 Cocktail Bar" if c.type == "cocktail_bar" else " 🍽️ Restaurant"
+                        fav = " ❤️" if c.favorite else ""
+                        vis = " ✅ Visited" if c.visited else ""
+                        vis_date = f" ({c.visited_date})" if c.visited_date else ""
+                        retired_str = " (Retired)" if c.retired else ""
+                        st.markdown(f"# {c.name}{tag}{fav}{vis}{vis_date}{retired_str}")
+                        st.markdown(f"**{c.cuisine} • {c.price} • {c.location}**")
+                        idx = restaurants.index(c)
+                        col_fav, col_vis = st.columns(2)
+                        with col_fav:
+                            if st.button("❤️ Unfavorite" if c.favorite else "❤️ Favorite",
+                                         key=f"rand_fav_{idx}", use_container_width=True):
+                                toggle_favorite(restaurants, idx)
+                                st.rerun()
+                        with col_vis:
+                            if st.button("✅ Mark as Unvisited" if c.visited else "✅ Mark as Visited",
+                                         key=f"rand_vis_{idx}", type="secondary", use_container_width=True):
+                                toggle_visited(restaurants, idx)
+                                st.rerun()
+
+                        st.markdown("---")
+                        st.write(f"📍 **Address:** {c.address}")
+                        st.markdown(f"[🗺️ Open in Google Maps]({google_maps_link(c.address, c.name)})", unsafe_allow_html=True)
+
+                        if c.reviews:
+                            st.markdown("### 📝 Notes")
+                            for note in c.reviews:
+                                if note and str(note).strip():
+                                    with st.container(border=True):
+                                        st.write(str(note).strip())
+                        else:
+                            st.info("No notes yet!")
+
+                        if c.images:
+                            st.markdown("### 📸 Photos")
+                            cols = st.columns(3)
+                            for i, img_url in enumerate(c.images):
+                                with cols[i % 3]:
+                                    st.image(photo_src(img_url), use_column_width=True)
+
+                        similar_places = places_like(restaurants, c)
+                        if similar_places:
+                            st.markdown("### 👯 Places like this")
+                            for p, score in similar_places:
+                                st.markdown(f"[**{p.name}**]({google_maps_link(p.address, p.name)}) — "
+                                            f"{p.cuisine} • {p.price} • {p.location} · {score:.0%} match")
+
+                        st.markdown("---")
+                        if st.button("🎲 Pick Again (from same filters)", type="secondary", use_container_width=True):
+                            placeholder = st.empty()
+                            for _ in range(50):
+                                temp_pick = random.choice(filtered)
+                                placeholder.markdown(f"## 🎲 {temp_pick.name}")
+                                time.sleep(0.05)
+                            placeholder.empty()
+                            picked = random.choice(filtered)
+                            st.session_state.last_pick = picked
+                            st.rerun()
+                else:
+                    st.info("Previous pick no longer matches current filters — pick again!")
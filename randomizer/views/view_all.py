@@ -0,0 +1,298 @@
+from datetime import date
+
+import streamlit as st
+
+from randomizer import perf
+from randomizer.constants import CUISINES, NEIGHBORHOODS, PLACE_TYPES, PRICES
+from randomizer.db import delete_restaurant, save_data, toggle_favorite, toggle_visited
+from randomizer.geo import get_lat_lon, google_maps_link
+from randomizer.images import delete_image_from_storage, upload_images_to_supabase
+from randomizer.photo_cache import photo_resolver
+from randomizer.search import get_note_index, highlight
+
+
+SORT_OPTIONS = ["A-Z (Name)", "Favorites First", "Recently Added", "Oldest First", "Not Visited First", "Best Match"]
+NOTE_MATCH_LIMIT = 50
+
+
+@perf.timed("view_all.search")
+def search_places(restaurants, search_term):
+    """Returns (places, snippets): field matches first, then places whose notes match, ranked."""
+    filtered = restaurants.copy()
+    snippets = {}
+    if search_term:
+        lower = search_term.lower()
+        filtered = [r for r in filtered if lower in r.name.lower() or
+                    lower in r.cuisine.lower() or lower in r.location.lower() or
+                    lower in r.address.lower()]
+        hits = get_note_index().search(search_term, limit=NOTE_MATCH_LIMIT)
+        if hits:
+            by_id = {r.id: r for r in restaurants}
+            already = {id(r) for r in filtered}
+            for place_id, _, note_no in hits:
+                r = by_id.get(place_id)
+                if r is None or note_no >= len(r.reviews):
+                    continue
+                snippets[place_id] = highlight(r.reviews[note_no], search_term)
+                if id(r) not in already:
+                    filtered.append(r)
+    return filtered, snippets
+
+
+@perf.timed("view_all.sort")
+def sort_places(filtered, sort_option):
+    if sort_option == "A-Z (Name)":
+        sorted_places = sorted(filtered, key=lambda x: x.name.lower())
+    elif sort_option == "Favorites First":
+        sorted_places = sorted([r for r in filtered if r.favorite], key=lambda x: x.name.lower()) + \
+                        sorted([r for r in filtered if not r.favorite], key=lambda x: x.name.lower())
+    elif sort_option == "Recently Added":
+        sorted_places = sorted(
+            filtered,
+            key=lambda x: x.created,
+            reverse=True
+        )
+    elif sort_option == "Oldest First":
+        sorted_places = sorted(
+            filtered,
+            key=lambda x: x.created
+        )
+    elif sort_option == "Not Visited First":
+        sorted_places = sorted([r for r in filtered if not r.visited], key=lambda x: x.name.lower()) + \
+                        sorted([r for r in filtered if r.visited], key=lambda x: x.name.lower())
+    else:
+        sorted_places = filtered
+    return sorted_places
+
+
+def render(restaurants):
+    st.header("All Places 👀")
+    st.caption(f"{len(restaurants)} place(s)")
+    photo_src = photo_resolver()
+
+    if not restaurants:
+        st.info("No places added yet.")
+    else:
+        col_search, col_sort = st.columns([5, 3])
+        with col_search:
+            search_term = st.text_input("🔍 Search name, cuisine, neighborhood, address, notes", key="search_input")
+        with col_sort:
+            sort_option = st.selectbox("Sort by", SORT_OPTIONS)
+
+        filtered, snippets = search_places(restaurants, search_term)
+        sorted_places = sort_places(filtered, sort_option)
+
+        for idx, r in enumerate(sorted_places):
+            global_idx = restaurants.index(r)
+            icon = " 🍸" if r.type == "cocktail_bar" else " 🍽️"
+            fav = " ❤️" if r.favorite else ""
+            visited = " ✅" if r.visited else ""
+            visited_date_str = f" (visited {r.visited_date})" if r.visited and r.visited_date else ""
+            retired_str = " (Retired)" if r.retired else ""
+            img_count = f" • {len(r.images)} photo{'s' if len(r.images) > 1 else ''}" if r.images else ""
+            notes_count = f" • {len(r.reviews)} note{'s' if len(r.reviews) != 1 else ''}" if r.reviews else ""
+
+            with st.expander(f"{r.name}{icon}{fav}{visited}{visited_date_str}{retired_str} • {r.cuisine} • {r.price} • {r.location}{img_count}{notes_count}",
+                             expanded=(f"edit_mode_{global_idx}" in st.session_state)):
+                if f"edit_mode_{global_idx}" not in st.session_state:
+                    if r.id in snippets:
+                        st.markdown(f"🔎 _{snippets[r.id]}_")
+                    btn1, btn2, btn3, btn4 = st.columns(4)
+                    with btn1:
+                        if st.button("❤️ Favorite" if not r.favorite else "💔 Unfavorite", key=f"fav_{global_idx}", use_container_width=True):
+                            toggle_favorite(restaurants, global_idx)
+                            st.rerun()
+                    with btn2:
+                        if st.button("✅ Mark Visited" if not r.visited else "❌ Mark Unvisited", key=f"vis_{global_idx}", type="secondary", use_container_width=True):
+                            toggle_visited(restaurants, global_idx)
+                            st.rerun()
+                    with btn3:
+                        if st.button("Edit ✏️", key=f"edit_{global_idx}", use_container_width=True):
+                            st.session_state[f"edit_mode_{global_idx}"] = True
+                            st.rerun()
+                    with btn4:
+                        delete_key = f"del_confirm_{global_idx}"
+                        if delete_key in st.session_state:
+                            if st.button("🗑️ Confirm Delete", type="primary", key=f"conf_{global_idx}", use_container_width=True):
+                                if delete_restaurant(restaurants, global_idx):
+                                    st.session_state.success_message = f"Removed {r.name} and its photos."
+                                    st.rerun()
+                        else:
+                            if st.button("Delete 🗑️", key=f"del_{global_idx}", use_container_width=True):
+                                st.session_state[delete_key] = True
+                                st.rerun()
+                    if delete_key in st.session_state:
+                        if st.button("Cancel Delete", key=f"can_{global_idx}", use_container_width=True):
+                            del st.session_state[delete_key]
+                            st.rerun()
+
+                    st.markdown("---")
+                    col_addr, col_map = st.columns([3, 1])
+                    with col_addr:
+                        st.write(f"**📍 Address:** {r.address or 'Not provided'}")
+                        if not r.latitude:
+                            st.caption("⚠️ No coordinates found for map.")
+                    with col_map:
+                        st.markdown(f"[🗺️ Open in Maps]({google_maps_link(r.address, r.name)})", unsafe_allow_html=True)
+
+                    if r.reviews:
+                        st.markdown("**📝 Notes**")
+                        for note in reversed(r.reviews):
+                            if note and str(note).strip():
+                                with st.container(border=True):
+                                    st.write(str(note).strip())
+                    else:
+                        st.caption("_No notes yet — be the first to add one!_")
+
+                    if r.images:
+                        st.markdown("**📸 Photos**")
+                        num_images = len(r.images)
+                        for i in range(0, num_images, 3):
+                            cols = st.columns(3)
+                            for j in range(3):
+                                idx_img = i + j
+                                if idx_img < num_images:
+                                    with cols[j]:
+                                        st.image(photo_src(r.images[idx_img]), use_column_width=True)
+
+                else:
+                    # EDIT MODE
+                    st.subheader(f"Editing: {r.name}")
+                    images_to_delete_key = f"images_to_delete_{global_idx}"
+                    reviews_key = f"edit_reviews_{global_idx}"
+
+                    edit_name = st.text_input("Name", value=r.name, key=f"edit_name_{global_idx}")
+                    edit_cuisine = st.selectbox("Cuisine/Style", CUISINES,
+                                                index=CUISINES.index(r.cuisine) if r.cuisine in CUISINES else 0,
+                                                key=f"edit_cuisine_{global_idx}")
+                    edit_price = st.selectbox("Price", PRICES,
+                                              index=PRICES.index(r.price),
+                                              key=f"edit_price_{global_idx}")
+                    edit_location = st.selectbox("Neighborhood", NEIGHBORHOODS,
+                                                 index=NEIGHBORHOODS.index(r.location) if r.location in NEIGHBORHOODS else 0,
+                                                 key=f"edit_location_{global_idx}")
+                    edit_address = st.text_input("Address", value=r.address, key=f"edit_address_{global_idx}")
+                    edit_type = st.selectbox("Type", PLACE_TYPES,
+                                             index=0 if r.type == "restaurant" else 1,
+                                             format_func=lambda x: "Restaurant 🍽️" if x == "restaurant" else "Cocktail Bar 🍸",
+                                             key=f"edit_type_{global_idx}")
+                    edit_retired = st.checkbox("😔 Retired?", value=r.retired, key=f"edit_retired_{global_idx}")
+                    edit_visited = st.checkbox("✅ I've already visited this place", value=r.visited,
+                                               key=f"edit_visited_{global_idx}")
+
+                    existing_date = r.visited_on
+                    default_edit_date = date.today() if edit_visited and existing_date is None else existing_date
+                    edit_visited_date = st.date_input(
+                        "Date Visited (optional)",
+                        value=default_edit_date,
+                        key=f"edit_visited_date_{global_idx}"
+                    )
+                    visited_date_edit = edit_visited_date if edit_visited_date is not None else None
+
+                    st.markdown("### Add more photos")
+                    new_images = st.file_uploader("Upload additional photos", type=["png", "jpg", "jpeg", "webp"],
+                                                  accept_multiple_files=True, key=f"edit_images_{global_idx}")
+
+                    if r.images:
+                        st.markdown("### Current photos")
+                        if images_to_delete_key not in st.session_state:
+                            st.session_state[images_to_delete_key] = set()
+                        cols = st.columns(3)
+                        for i, img_url in enumerate(r.images):
+                            with cols[i % 3]:
+                                st.image(photo_src(img_url), use_column_width=True)
+                                if st.checkbox("Delete this photo", key=f"del_img_{global_idx}_{i}"):
+                                    st.session_state[images_to_delete_key].add(img_url)
+
+                    st.markdown("### Notes")
+                    if reviews_key not in st.session_state:
+                        st.session_state[reviews_key] = list(r.reviews)
+                    current_reviews = st.session_state[reviews_key]
+
+                    for rev_idx, note in enumerate(current_reviews):
+                        col1, col2 = st.columns([8, 1])
+                        with col1:
+                            new_note = st.text_area(
+                                "Note",
+                                value=note or "",
+                                key=f"rev_comment_{global_idx}_{rev_idx}",
+                                label_visibility="collapsed",
+                                height=100
+                            )
+                        with col2:
+                            if st.button("🗑️", key=f"del_rev_{global_idx}_{rev_idx}"):
+                                st.session_state[reviews_key].pop(rev_idx)
+                                st.rerun()
+                        if new_note != note:
+                            st.session_state[reviews_key][rev_idx] = new_note
+
+                    st.markdown("**Add a new note**")
+                    new_note_text = st.text_area("New note (optional)", height=100, key=f"new_note_{global_idx}")
+                    if new_note_text.strip() and st.button("➕ Add Note", key=f"add_note_btn_{global_idx}"):
+                        st.session_state[reviews_key].append(new_note_text.strip())
+                        st.rerun()
+
+                    if not current_reviews:
+                        st.info("No notes yet.")
+
+                    col_save, col_cancel = st.columns(2)
+                    with col_save:
+                        if st.button("💾 Save Changes", type="primary", use_container_width=True, key=f"save_{global_idx}"):
+                            new_image_urls = []
+                            if new_images:
+                                with st.spinner("Uploading new images..."):
+                                    new_image_urls = upload_images_to_supabase(new_images, edit_name)
+
+                            remaining_images = list(r.images)
+                            if images_to_delete_key in st.session_state:
+                                for url in list(st.session_state[images_to_delete_key]):
+                                    if url in remaining_images:
+                                        remaining_images.remove(url)
+                                    # Delete from storage
+                                    delete_image_from_storage(url)
+
+                            cleaned_reviews = [n.strip() for n in st.session_state.get(reviews_key, r.reviews) if n and n.strip()]
+
+                            new_lat, new_lon = r.latitude, r.longitude
+                            if edit_address.strip() != r.address:
+                                with st.spinner("Location changed. Updating coordinates..."):
+                                    fetched_lat, fetched_lon = get_lat_lon(edit_address.strip())
+                                    if fetched_lat:
+                                        new_lat, new_lon = fetched_lat, fetched_lon
+                                    else:
+                                        st.warning("Could not map new address. Coordinates cleared.")
+                                        new_lat, new_lon = None, None
+
+                            restaurants[global_idx].update(
+                                name=edit_name.strip(),
+                                cuisine=edit_cuisine,
+                                price=edit_price,
+                                location=edit_location,
+                                address=edit_address.strip(),
+                                type=edit_type,
+                                visited=edit_visited,
+                                images=remaining_images + new_image_urls,
+                                reviews=cleaned_reviews,
+                                latitude=new_lat,
+                                longitude=new_lon,
+                                retired=edit_retired
+                            )
+                            restaurants[global_idx].set_visited_on(visited_date_edit)
+                            save_data([restaurants[global_idx]])
+
+                            del st.session_state[f"edit_mode_{global_idx}"]
+                            if images_to_delete_key in st.session_state:
+                                del st.session_state[images_to_delete_key]
+                            if reviews_key in st.session_state:
+                                del st.session_state[reviews_key]
+                            st.session_state.success_message = "Changes saved!"
+                            st.rerun()
+
+                    with col_cancel:
+                        if st.button("❌ Cancel", use_container_width=True, key=f"cancel_{global_idx}"):
+                            del st.session_state[f"edit_mode_{global_idx}"]
+                            if images_to_delete_key in st.session_state:
+                                del st.session_state[images_to_delete_key]
+                            if reviews_key in st.session_state:
+                                del st.session_state[reviews_key]
+                            st.rerun()
@@ -0,0 +1,82 @@
+import pytest
+import streamlit as st
+
+from randomizer import feed, search, similar
+from randomizer.models import Place
+
+
+@pytest.fixture(autouse=True)
+def indexes(monkeypatch):
+    """Fresh in-memory indexes, so publishing never touches data/ or another test's state."""
+    notes = search.NoteIndex()
+    monkeypatch.setattr(notes, "save_async", lambda: None)
+    monkeypatch.setattr(search, "get_note_index", lambda: notes)
+    monkeypatch.setattr(similar, "get_similarity_index", similar.SimilarityIndex)
+
+
+def row(place_id, **changes):
+    place = Place(name=f"Place {place_id}", cuisine="Thai", price="$$", location="Uptown", address="",
+                  type="Restaurant", id=place_id)
+    return dict(feed.place_row(place), **changes)
+
+
+def test_publish_drops_echoes_of_the_same_row():
+    change_feed = feed.ChangeFeed()
+    assert change_feed.publish(feed.UPDATE, row(1, favorite=True)) == 1
+    # Realtime sends our own write back, with the DB's own spelling of the values.
+    assert change_feed.publish(feed.UPDATE, dict(row(1, favorite=True), reviews=None, images=None)) == 1
+    assert change_feed.publish(feed.UPDATE, row(1, favorite=False)) == 2
+    assert change_feed.publish(feed.DELETE, {"id": 1}) == 3
+    assert change_feed.publish(feed.DELETE, {"id": 1}) == 3
+    assert [kind for _, kind, _ in change_feed.since(0)] == [feed.UPDATE, feed.UPDATE, feed.DELETE]
+
+
+def test_since_returns_none_once_the_log_has_moved_past():
+    change_feed = feed.ChangeFeed(max_events=3)
+    for place_id in range(1, 6):
+        change_feed.publish(feed.INSERT, row(place_id))
+    assert change_feed.since(5) == []
+    assert [seq for seq, _, _ in change_feed.since(2)] == [3, 4, 5]
+    assert change_feed.since(1) is None
+
+
+def test_apply_events_updates_records_in_place():
+    restaurants = Place.from_rows([row(1), row(2)])
+    first = restaurants[0]
+    kinds = feed.apply_events(restaurants, [(1, feed.UPDATE, row(1, name="Renamed", favorite=True))])
+    assert kinds == {feed.UPDATE}
+    assert restaurants[0] is first
+    assert (first.name, first.favorite) == ("Renamed", True)
+
+
+def test_apply_events_insert_then_delete_in_one_batch():
+    restaurants = Place.from_rows([row(1)])
+    events = [(1, feed.INSERT, row(2)), (2, feed.UPDATE, row(2, name="Edited")), (3, feed.DELETE, {"id": 2})]
+    feed.apply_events(restaurants, events)
+    assert [r.id for r in restaurants] == [1]
+    # Replaying the same batch is a no-op.
+    feed.apply_events(restaurants, events)
+    assert [r.id for r in restaurants] == [1]
+
+
+def test_apply_pending_reloads_when_too_far_behind(monkeypatch):
+    change_feed = feed.ChangeFeed(max_events=2)
+    monkeypatch.setattr(feed, "get_change_feed", lambda: change_feed)
+    st.session_state.feed_seq = 0
+    for place_id in range(1, 4):
+        change_feed.publish(feed.INSERT, row(place_id))
+    restaurants = Place.from_rows([row(1)])
+    reloads = []
+
+    def reload():
+        reloads.append(True)
+        return Place.from_rows([row(1), row(2), row(3)])
+
+    kinds = feed.apply_pending(restaurants, reload)
+    assert reloads == [True]
+    assert kinds == {feed.INSERT, feed.UPDATE, feed.DELETE}
+    assert [r.id for r in restaurants] == [1, 2, 3]
+    assert st.session_state.feed_seq == 3
+    # Caught up: the next call applies nothing and doesn't reload.
+    assert feed.apply_pending(restaurants, reload) == set()
+    assert reloads == [True]
@@ -0,0 +1,43 @@
+from randomizer.models import Place
+
+ROW = {
+    "id": 7, "name": "Golden Tavern", "cuisine": "Mexican", "price": "$$", "location": "Pilsen",
+    "address": "1 W 18th St", "type": "Restaurant", "favorite": True, "visited": True,
+    "visited_date": "May 01, 2024", "reviews": ["  great mole ", {"comment": "cash only"}, "", None],
+    "images": ["https://example.invalid/a.jpg"], "latitude": 41.85, "longitude": -87.66, "retired": False,
+    "created_at": "2024-05-01T12:00:00+00:00", "extra_column": "ignored",
+}
+
+
+def test_from_row_round_trips_to_row():
+    place = Place.from_row(ROW)
+    assert place.reviews == ("great mole", "cash only")
+    assert place.images == ("https://example.invalid/a.jpg",)
+    row = place.to_row()
+    for key in ("name", "cuisine", "price", "location", "address", "type", "favorite", "visited",
+                "visited_date", "latitude", "longitude", "retired", "created_at"):
+        assert row[key] == ROW[key]
+
+
+def test_from_row_fills_missing_and_null_columns():
+    old = {"name": "Old Place", "cuisine": "Thai", "price": "$", "location": "Uptown", "type": "Restaurant",
+           "address": None, "favorite": None}
+    place = Place.from_row(old)
+    assert (place.address, place.favorite, place.visited, place.retired) == ("", False, False, False)
+    assert (place.reviews, place.images, place.latitude, place.id, place.created) == ((), (), None, None,
+                                                                                     place.created.min)
+
+
+def test_from_row_maps_missing_and_null_text_columns_to_empty_strings():
+    for row in (dict(ROW, name=None, cuisine=None, price=None, location=None, type=None), {"id": 3}):
+        place = Place.from_row(row)
+        assert (place.name, place.cuisine, place.price, place.location, place.type) == ("", "", "", "", "")
+    assert [p.id for p in Place.from_rows([dict(ROW, cuisine=None), {"id": 3}, ROW])] == [7, 3, 7]
+
+
+def test_from_rows_converts_in_place_and_interns_categories():
+    rows = [dict(ROW, id=1, cuisine="".join(["Mex", "ican"])), dict(ROW, id=2)]
+    places = Place.from_rows(rows)
+    assert places is rows
+    assert [p.id for p in places] == [1, 2]
+    assert places[0].cuisine is places[1].cuisine
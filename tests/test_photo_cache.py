@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+
+import pytest
+
+from benchmarks.fakes import FakeStorageServer
+from randomizer.photo_cache import STATIC_URL, PhotoCache, cache_name
+
+PHOTOS = {f"restaurant-images/Place_{i}/photo_{i}.jpg": bytes([i]) * 1000 for i in range(3)}
+
+
+@pytest.fixture
+def server():
+    server = FakeStorageServer(PHOTOS)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def urls(server):
+    return [server.url(path) for path in PHOTOS]
+
+
+def make_cache(tmp_path, **kwargs):
+    return PhotoCache(str(tmp_path / "photos"), str(tmp_path / "photo_cache.json"), **kwargs)
+
+
+def cached(cache, *urls):
+    for url in urls:
+        cache.src(url)
+        cache.wait()
+
+
+def saved_urls(cache):
+    with open(cache.index_path) as f:
+        return [url for url, *_ in json.load(f)]
+
+
+def test_miss_returns_the_bucket_url_and_queues_a_fetch(tmp_path, server, urls):
+    cache = make_cache(tmp_path)
+    assert cache.src(urls[0]) == urls[0]
+    cache.wait()
+    assert cache.misses == 1
+    assert server.requests == 1
+    with open(os.path.join(cache.directory, cache_name(urls[0])), "rb") as f:
+        assert f.read() == PHOTOS["restaurant-images/Place_0/photo_0.jpg"]
+    assert saved_urls(cache) == [urls[0]]
+
+
+def test_hit_returns_the_static_url(tmp_path, server, urls):
+    cache = make_cache(tmp_path)
+    cached(cache, urls[0])
+    assert cache.src(urls[0]) == STATIC_URL + cache_name(urls[0])
+    assert cache.read(urls[0]) == PHOTOS["restaurant-images/Place_0/photo_0.jpg"]
+    assert cache.hits == 1
+    assert server.requests == 1
+
+
+def test_revalidation_answered_with_304_keeps_the_entry(tmp_path, server, urls):
+    cache = make_cache(tmp_path)
+    cached(cache, urls[0])
+    cache.entries[urls[0]]["checked"] = 0
+    sent = server.bytes_sent
+    cache.src(urls[0])  # stale: served as-is and revalidated in the background
+    cache.wait()
+    assert server.requests == 2
+    assert server.bytes_sent == sent
+    assert cache.revalidated == 1 and cache.refetched == 0
+    assert cache.entries[urls[0]]["checked"] > 0
+    assert cache.src(urls[0]) == STATIC_URL + cache_name(urls[0])
+
+
+def test_least_recently_used_photo_is_evicted_past_max_bytes(tmp_path, server, urls):
+    cache = make_cache(tmp_path, max_bytes=2500)
+    cached(cache, urls[0], urls[1])
+    cache.src(urls[0])  # now urls[1] is the least recently used
+    cached(cache, urls[2])
+    assert list(cache.entries) == [urls[0], urls[2]]
+    assert cache.evictions == 1
+    assert cache.total_bytes == 2000
+    assert not os.path.exists(os.path.join(cache.directory, cache_name(urls[1])))
+    assert saved_urls(cache) == [urls[0], urls[2]]
+
+
+def test_discard_removes_the_file(tmp_path, server, urls):
+    cache = make_cache(tmp_path)
+    cached(cache, urls[0], urls[1])
+    cache.discard(urls[0])
+    assert urls[0] not in cache.entries
+    assert cache.total_bytes == 1000
+    assert not os.path.exists(os.path.join(cache.directory, cache_name(urls[0])))
+    assert saved_urls(cache) == [urls[1]]
+
+
+def test_load_index_drops_entries_whose_file_changed_size(tmp_path, server, urls):
+    cache = make_cache(tmp_path)
+    cached(cache, urls[0], urls[1])
+    with open(os.path.join(cache.directory, cache_name(urls[0])), "ab") as f:
+        f.write(b"truncated download")
+    restored = make_cache(tmp_path)
+    assert list(restored.entries) == [urls[1]]
+    assert restored.total_bytes == 1000
+
+
+def test_src_does_not_wait_for_index_writes(tmp_path, server, urls):
+    cache = make_cache(tmp_path)
+    cached(cache, urls[0], urls[1])
+    with cache._save_lock:  # an index write stuck on a slow disk
+        writer = threading.Thread(target=cache.discard, args=(urls[1],))
+        writer.start()
+        writer.join(0.1)
+        assert writer.is_alive()
+        assert cache.src(urls[0]) == STATIC_URL + cache_name(urls[0])
+    writer.join()
+    assert saved_urls(cache) == [urls[0]]
+
+
+def test_peek_neither_fetches_nor_counts(tmp_path, server, urls):
+    cache = make_cache(tmp_path)
+    assert cache.peek(urls[0]) == urls[0]
+    cache.wait()
+    assert server.requests == 0 and urls[0] not in cache.entries
+    cached(cache, urls[0], urls[1])
+    hits, saved = cache.hits, cache.bytes_saved
+    assert cache.peek(urls[0]) == STATIC_URL + cache_name(urls[0])
+    assert (cache.hits, cache.bytes_saved) == (hits, saved)
+    assert list(cache.entries) == [urls[0], urls[1]]
@@ -0,0 +1,69 @@
+from randomizer.models import Place
+from randomizer.search import NoteIndex
+
+
+def place(place_id, *notes):
+    return Place(name=f"Place {place_id}", cuisine="Mexican", price="$", location="Pilsen", address="",
+                 type="Restaurant", reviews=notes, id=place_id)
+
+
+def hit_ids(index, query):
+    return {place_id for place_id, _, _ in index.search(query, limit=10)}
+
+
+def test_sync_keeps_places_missing_from_an_older_snapshot():
+    index = NoteIndex()
+    index.sync([place(1, "great tacos")])
+    # Another session adds place 2 and the feed indexes it...
+    index.update_place(2, ["tacos al pastor"])
+    # ...then a session whose snapshot predates the insert finishes loading.
+    index.sync([place(1, "great tacos")])
+    assert hit_ids(index, "tacos") == {1, 2}
+
+
+def test_sync_reindexes_changed_notes():
+    index = NoteIndex()
+    index.sync([place(1, "great tacos")])
+    index.sync([place(1, "great ramen")])
+    assert hit_ids(index, "tacos") == set()
+    assert hit_ids(index, "ramen") == {1}
+
+
+def test_removals_come_from_remove_place():
+    index = NoteIndex()
+    index.sync([place(1, "great tacos"), place(2, "tacos again")])
+    index.remove_place(2)
+    assert hit_ids(index, "tacos") == {1}
+
+
+def test_first_sync_after_load_drops_places_deleted_while_down(tmp_path):
+    path = str(tmp_path / "notes_index.bin")
+    index = NoteIndex()
+    index.sync([place(1, "great tacos"), place(2, "tacos again")])
+    index.save(path)
+
+    restored = NoteIndex.load(path)
+    restored.sync([place(1, "great tacos")])
+    assert hit_ids(restored, "tacos") == {1}
+    # Only the first sync prunes; later snapshots can be stale.
+    restored.update_place(3, ["tacos"])
+    restored.sync([place(1, "great tacos")])
+    assert hit_ids(restored, "tacos") == {1, 3}
+
+
+def test_doc_lengths_follow_edits_and_survive_a_save_with_holes(tmp_path):
+    index = NoteIndex()
+    index.sync([place(i, "tacos and more tacos", "patio") for i in range(1, 1500)])
+    assert index.search("tacos")  # builds the length array
+    index.update_place(1, ["short tacos note with a few extra words"])
+    index.remove_place(2)
+    index.update_place(5000, ["brand new tacos"])
+    rebuilt = NoteIndex()
+    rebuilt.docs = index.docs
+    assert list(index._doc_lengths()) == list(rebuilt._doc_lengths())
+
+    path = str(tmp_path / "notes_index.bin")
+    index.save(path)
+    restored = NoteIndex.load(path)
+    assert (len(restored), restored.total_len) == (len(index), index.total_len)
+    assert restored.search("tacos", limit=5) == index.search("tacos", limit=5)
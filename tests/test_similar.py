@@ -0,0 +1,31 @@
+from randomizer.models import Place
+from randomizer.similar import SimilarityIndex
+
+
+def place(place_id, cuisine="Mexican", location="Pilsen"):
+    return Place(name=f"Place {place_id}", cuisine=cuisine, price="$$", location=location, address="",
+                 type="Restaurant", latitude=41.85, longitude=-87.66, id=place_id)
+
+
+def test_sync_keeps_places_missing_from_an_older_snapshot():
+    index = SimilarityIndex()
+    index.sync([place(1), place(2)])
+    index.update_place(place(3))  # added by another session through the feed
+    index.sync([place(1), place(2)])
+    assert {pid for pid, _ in index.similar(1)} == {2, 3}
+
+
+def test_sync_reencodes_changed_places():
+    index = SimilarityIndex()
+    index.sync([place(1), place(2), place(3, cuisine="Thai", location="Uptown")])
+    index.sync([place(1), place(2, cuisine="Thai", location="Uptown"), place(3, cuisine="Thai", location="Uptown")])
+    assert index.similar(2)[0][0] == 3
+
+
+def test_remove_place_frees_the_row():
+    index = SimilarityIndex()
+    index.sync([place(1), place(2), place(3)])
+    index.remove_place(2)
+    assert [pid for pid, _ in index.similar(1)] == [3]
+    index.update_place(place(4))
+    assert len(index) == 3 and index.size == 3